@@ -0,0 +1,194 @@
+"""
+Time and peak memory of every `ta` indicator on synthetic OHLCV, next to the finta implementation
+
+    python benchmarks/bench_indicators.py                          # 1e3 .. 1e6 bars, periods 10, 50, 200
+    python benchmarks/bench_indicators.py --sizes 1e7 --periods 20
+    python benchmarks/bench_indicators.py --save                   # record benchmarks/baseline.json
+    python benchmarks/bench_indicators.py --check                  # exit 1 on regressions against it
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from indicators import ta
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+PERIODS = [10, 50, 200]
+# finta's WMA, SMM and VAMA are pure python rolling applies, too slow to run on more bars
+FINTA_MAX_SIZE = 100_000
+# timings shorter than this are mostly noise and never count as regressions
+MIN_SECONDS = 1e-3
+
+# indicator: call with (ohlcv, period), the same arguments work for ta and finta's TA
+cases = {'SMA': lambda lib, ohlcv, period: lib.SMA(ohlcv, period),
+         'SMM': lambda lib, ohlcv, period: lib.SMM(ohlcv, period),
+         'SSMA': lambda lib, ohlcv, period: lib.SSMA(ohlcv, period),
+         'EMA': lambda lib, ohlcv, period: lib.EMA(ohlcv, period),
+         'DEMA': lambda lib, ohlcv, period: lib.DEMA(ohlcv, period),
+         'TEMA': lambda lib, ohlcv, period: lib.TEMA(ohlcv, period),
+         'TRIMA': lambda lib, ohlcv, period: lib.TRIMA(ohlcv, period),
+         'TRIX': lambda lib, ohlcv, period: lib.TRIX(ohlcv, period),
+         'VAMA': lambda lib, ohlcv, period: lib.VAMA(ohlcv, period),
+         'WMA': lambda lib, ohlcv, period: lib.WMA(ohlcv, period),
+         'SMMA': lambda lib, ohlcv, period: lib.SMMA(ohlcv, period),
+         'MACD': lambda lib, ohlcv, period: lib.MACD(ohlcv, period, 2 * period),
+         'MOM': lambda lib, ohlcv, period: lib.MOM(ohlcv, period),
+         'ROC': lambda lib, ohlcv, period: lib.ROC(ohlcv, period),
+         'RSI': lambda lib, ohlcv, period: lib.RSI(ohlcv, period),
+         'TR': lambda lib, ohlcv, period: lib.TR(ohlcv),
+         'ATR': lambda lib, ohlcv, period: lib.ATR(ohlcv, period),
+         'BBANDS': lambda lib, ohlcv, period: lib.BBANDS(ohlcv, period),
+         'KC': lambda lib, ohlcv, period: lib.KC(ohlcv, period),
+         'STOCH': lambda lib, ohlcv, period: lib.STOCH(ohlcv, period),
+         'WILLIAMS': lambda lib, ohlcv, period: lib.WILLIAMS(ohlcv, period)}
+# indicators without a period are run once per size
+no_period = ['TR']
+
+
+def synthetic_ohlcv(size, seed=0) -> pd.DataFrame:
+    """
+    `size` hourly candles of a geometric random walk
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(scale=1e-2, size=size)))
+    open = np.append(close[0], close[:-1])
+    spread = np.abs(rng.normal(scale=5e-3, size=size)) * close
+    return pd.DataFrame({'open': open, 'high': np.maximum(open, close) + spread,
+                         'low': np.minimum(open, close) - spread, 'close': close,
+                         'volume': rng.lognormal(10, 1, size=size)},
+                        index=pd.date_range('2020-01-01', periods=size, freq='h'))
+
+
+def measure(function, repeat=3) -> tuple:
+    """
+    Best wall time of `repeat` calls in seconds, and peak memory allocated by one more traced call in MB
+    """
+    seconds = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds = min(seconds, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak / 2 ** 20
+
+
+def calibrate(repeat=5) -> float:
+    """
+    Seconds of a fixed numpy workload, used to scale baselines recorded on another machine
+    """
+    values = np.random.default_rng(0).random(1_000_000)
+    return min(measure(lambda: np.cumsum(np.sort(values)), repeat=1)[0] for _ in range(repeat))
+
+
+def key(result) -> str:
+    return f"{result['indicator']}/{result['size']}/{result['period']}"
+
+
+def run(sizes=SIZES, periods=PERIODS, indicators=None, repeat=3, finta_max_size=FINTA_MAX_SIZE) -> list:
+    """
+    One result dict per indicator, size and period, with finta_* fields left None above `finta_max_size` bars
+    """
+    from finta import TA
+
+    results = []
+    for size in sizes:
+        ohlcv = synthetic_ohlcv(int(size))
+        for indicator in indicators or cases:
+            call = cases[indicator]
+            for period in [None] if indicator in no_period else periods:
+                seconds, peak_mb = measure(lambda: call(ta, ohlcv, period), repeat)
+                finta_seconds = finta_peak_mb = None
+                if size <= finta_max_size:
+                    finta_seconds, finta_peak_mb = measure(lambda: call(TA, ohlcv, period), repeat)
+                results.append({'indicator': indicator, 'size': int(size), 'period': period, 'seconds': seconds,
+                                'peak_mb': peak_mb, 'finta_seconds': finta_seconds, 'finta_peak_mb': finta_peak_mb})
+    return results
+
+
+def save(results, path=BASELINE):
+    baseline = {'calibration': calibrate(),
+                'results': {key(result): {'seconds': result['seconds'], 'peak_mb': result['peak_mb']}
+                            for result in results}}
+    with open(path, 'w') as file:
+        json.dump(baseline, file, indent=1, sort_keys=True)
+
+
+def check(results, baseline, threshold=1.5, calibration=None) -> list:
+    """
+    Messages for results over `threshold` times their baseline time or peak memory.
+    Baseline times are scaled by how much slower this machine runs `calibrate`.
+    """
+    scale = 1.0 if calibration is None else calibration / baseline['calibration']
+    regressions = []
+    for result in results:
+        recorded = baseline['results'].get(key(result))
+        if recorded is None:
+            continue
+        limit = max(recorded['seconds'] * scale, MIN_SECONDS) * threshold
+        if result['seconds'] > limit:
+            regressions.append(f"{key(result)}: {result['seconds'] * 1e3:.2f} ms, "
+                               f"baseline {recorded['seconds'] * scale * 1e3:.2f} ms")
+        # small allocations come and go with pandas internals
+        if result['peak_mb'] > max(recorded['peak_mb'], 1.0) * threshold:
+            regressions.append(f"{key(result)}: {result['peak_mb']:.1f} MB peak, "
+                               f"baseline {recorded['peak_mb']:.1f} MB")
+    return regressions
+
+
+def report(results) -> pd.DataFrame:
+    frame = pd.DataFrame(results)
+    frame['period'] = frame['period'].astype('Int64')
+    frame['ms'] = frame.pop('seconds') * 1e3
+    frame['finta_ms'] = frame.pop('finta_seconds').astype(float) * 1e3
+    frame['speedup'] = frame['finta_ms'] / frame['ms']
+    return frame[['indicator', 'size', 'period', 'ms', 'peak_mb', 'finta_ms', 'finta_peak_mb', 'speedup']]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', type=float, default=SIZES)
+    parser.add_argument('--periods', nargs='+', type=int, default=PERIODS)
+    parser.add_argument('--indicators', nargs='+', choices=list(cases))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--finta-max-size', type=float, default=FINTA_MAX_SIZE)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save', action='store_true', help='write the results as the baseline')
+    parser.add_argument('--check', action='store_true', help='exit 1 if results regress against the baseline')
+    parser.add_argument('--threshold', type=float, default=1.5)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.periods, args.indicators, args.repeat, args.finta_max_size)
+    with pd.option_context('display.max_rows', None, 'display.width', 200, 'display.float_format', '{:.3f}'.format):
+        print(report(results).to_string(index=False))
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=1)
+    if args.save:
+        save(results, args.baseline)
+    if args.check:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = check(results, baseline, args.threshold, calibrate())
+        for regression in regressions:
+            print('REGRESSION', regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
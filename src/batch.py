@@ -0,0 +1,139 @@
+"""
+Compute indicator sets for many pairs and timeframes in a pool of processes, without any prompt:
+
+    python3 src/batch.py jobs.json --workers 8
+
+with jobs.json (or .yaml, which needs PyYAML) like
+
+    {"pairs": ["BTCUSDT", "ETHUSDT"],
+     "timeframes": ["1h", "1d"],
+     "start_date": "1 Jan, 2023",
+     "end_date": "now",
+     "indicators": {"trend": [["sma", 50], ["ema", 20]], "momentum": [["rsi", 14], ["macd", 12, 26]]},
+     "output_dir": "results",
+     "format": "csv"}
+
+Each pair and timeframe is downloaded once and gets one file per indicator set,
+e.g. results/BTCUSDT_1h_trend.csv. Optional keys: base_timeframe, dtype, cache_dir, download_workers and workers.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from get_data import Data
+from indicators import indicator_columns
+from kline_cache import DEFAULT_CACHE_DIR
+from output import export_frame
+from stats import Stats
+
+ohlcv_columns = ['time', 'open', 'high', 'low', 'close', 'volume']
+
+
+def load_spec(path) -> dict:
+    with open(path) as file:
+        if str(path).endswith(('.yaml', '.yml')):
+            import yaml
+
+            return yaml.safe_load(file)
+        return json.load(file)
+
+
+def make_jobs(spec) -> list:
+    """
+    One job per pair and timeframe of `spec`, each computing every indicator set
+    """
+    shared = {'start_date': spec.get('start_date', '1 Jan, 1900'),
+              'end_date': spec.get('end_date', 'now'),
+              'indicators': spec['indicators'],
+              'output_dir': spec.get('output_dir', '.'),
+              'format': spec.get('format', 'csv'),
+              'base_timeframe': spec.get('base_timeframe'),
+              'dtype': spec.get('dtype', 'float64'),
+              'cache_dir': spec.get('cache_dir', DEFAULT_CACHE_DIR),
+              # the weight limit of the downloader is per process, so each one pages sequentially by default
+              'download_workers': spec.get('download_workers', 1)}
+    return [dict(shared, pair=pair, timeframe=timeframe)
+            for pair, timeframe in itertools.product(spec['pairs'], spec['timeframes'])]
+
+
+def run_job(job) -> dict:
+    """
+    Download one pair/timeframe, compute all its indicator sets and write them, never raising:
+    failures are reported in the `error` of the result
+    """
+    result = {'pair': job['pair'], 'timeframe': job['timeframe'], 'rows': 0, 'files': [], 'error': None}
+    start = time.perf_counter()
+    stats = Stats()
+    try:
+        every_indicator = [info for infos in job['indicators'].values() for info in infos]
+        data = Data(job['pair'], job['timeframe'], job['start_date'], job['end_date'], every_indicator,
+                    cache_dir=job['cache_dir'], download_workers=job['download_workers'], stats=stats,
+                    base_timeframe=job['base_timeframe'], dtype=job['dtype'])
+        os.makedirs(job['output_dir'], exist_ok=True)
+        for name, infos in job['indicators'].items():
+            columns = ohlcv_columns + [column for info in infos for column in indicator_columns(info)]
+            path = os.path.join(job['output_dir'], f"{job['pair']}_{job['timeframe']}_{name}.{job['format']}")
+            export_frame(data.ohlcv[columns], path)
+            result['files'].append(path)
+        result['rows'] = len(data.ohlcv)
+    # Data exits when it can not reach binance
+    except (Exception, SystemExit):
+        result['error'] = traceback.format_exc()
+    result['seconds'] = time.perf_counter() - start
+    result['stages'] = stats.to_dict()
+    return result
+
+
+def run_batch(jobs, workers=os.cpu_count(), stream=sys.stdout) -> list:
+    """
+    Run `jobs` in `workers` processes (1 -- in this one), printing each result as it comes in and a summary
+    :return: the result of every job, in the order they finished
+    """
+    start = time.perf_counter()
+    results = []
+
+    def report(result):
+        results.append(result)
+        status = f"{result['rows']} rows in {result['seconds']:.2f}s" if result['error'] is None else \
+            'FAILED\n' + result['error']
+        print(f"[{len(results)}/{len(jobs)}] {result['pair']} {result['timeframe']}: {status}", file=stream)
+
+    if workers == 1:
+        for job in jobs:
+            report(run_job(job))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in as_completed([pool.submit(run_job, job) for job in jobs]):
+                report(future.result())
+
+    seconds = time.perf_counter() - start
+    rows = sum(result['rows'] for result in results)
+    failed = sum(result['error'] is not None for result in results)
+    print(f'{len(results) - failed} jobs done, {failed} failed, {rows} rows in {seconds:.1f}s '
+          f'({rows / seconds:.0f} rows/s, {len(results) / seconds:.2f} jobs/s)', file=stream)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('spec', help='job spec, .json or .yaml')
+    parser.add_argument('--workers', type=int, help='processes, default -- the spec\'s workers or one per CPU')
+    parser.add_argument('--report', help='also write every result to this file as JSON lines')
+    args = parser.parse_args(argv)
+
+    spec = load_spec(args.spec)
+    results = run_batch(make_jobs(spec), args.workers or spec.get('workers') or os.cpu_count())
+    if args.report:
+        with open(args.report, 'w') as file:
+            for result in results:
+                file.write(json.dumps(result) + '\n')
+    return 1 if any(result['error'] is not None for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
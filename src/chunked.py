@@ -0,0 +1,49 @@
+import pandas as pd
+
+from indicators import ROUNDING, warmup_bars, compute_indicator
+from kernels import IndicatorContext
+from output import FrameWriter
+from stats import stage
+
+
+def read_chunks(path, chunksize):
+    """
+    Frames of `chunksize` rows of a .csv (.csv.gz, ...) or .parquet file, the index counting on across them
+    """
+    if not str(path).endswith('.parquet'):
+        yield from pd.read_csv(path, chunksize=chunksize)
+        return
+    import pyarrow.parquet
+
+    start = 0
+    for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=chunksize):
+        frame = batch.to_pandas()
+        frame.index = pd.RangeIndex(start, start + len(frame))
+        start += len(frame)
+        yield frame
+
+
+def compute_chunked(source, output, indicators, chunksize=1_000_000) -> int:
+    """
+    Add the columns of `indicators` to the OHLCV table in file `source` and write it to file `output`,
+    holding only `chunksize` rows plus the warmup of the indicators in memory.
+    Each chunk is computed after the last rows of the one before it, as many as the indicators look back
+    (and as EMAs need for older bars to fall below float64 rounding), so the result is that of `ta` on the
+    whole table up to rounding, whatever the chunk size.
+    :param indicators: list like [['sma', 10], ['macd', 12, 26]], see Data
+    :return: number of rows written
+    """
+    overlap = warmup_bars(indicators, tolerance=ROUNDING)
+    carried = None
+    with FrameWriter(output) as writer:
+        for chunk in read_chunks(source, chunksize):
+            with stage('chunk', rows=len(chunk)):
+                columns = list(chunk.columns)
+                frame = chunk if carried is None else pd.concat([carried, chunk])
+                with IndicatorContext():
+                    for info in indicators:
+                        for column, values in compute_indicator(info, frame).items():
+                            chunk[column] = values.iloc[len(frame) - len(chunk):]
+                writer.write(chunk)
+                carried = frame[columns].iloc[max(0, len(frame) - overlap):] if overlap else None
+    return writer.rows
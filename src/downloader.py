@@ -0,0 +1,141 @@
+import json
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_URL = 'https://api.binance.com'
+KLINES_PATH = '/api/v3/klines'
+LIMIT = 1000
+
+
+class _WeightLimiter:
+    """
+    Keeps the request weight used in the current minute under `weight_limit`,
+    going by the X-MBX-USED-WEIGHT-1M header of the responses
+    """
+
+    def __init__(self, weight_limit):
+        self.weight_limit = weight_limit
+        self.lock = threading.Lock()
+        self.used = 0
+        self.paused_until = 0.0
+
+    def wait(self):
+        with self.lock:
+            if self.used >= self.weight_limit:
+                # the weight is counted per calendar minute
+                self.paused_until = max(self.paused_until, (time.time() // 60 + 1) * 60)
+                self.used = 0
+            delay = self.paused_until - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.time() + seconds)
+
+    def update(self, headers):
+        used = headers.get('X-MBX-USED-WEIGHT-1M')
+        if used is not None:
+            with self.lock:
+                self.used = int(used)
+
+
+class KlineDownloader:
+    """
+    Downloads klines from the REST klines endpoint in chunks of `LIMIT` candles fetched concurrently.
+    Has the `get_historical_klines` method of binance.client.Client, so it can stand in for one.
+    """
+
+    def __init__(self, max_workers=8, base_url=BASE_URL, weight_limit=1000, retries=5, timeout=10):
+        """
+        :param max_workers: number of requests in flight at once
+        :param base_url: root of the REST API, e.g. a local stand-in server
+        :param weight_limit: request weight per minute to stay under, below the 1200 binance allows
+        :param retries: attempts per chunk after 429/418, 5xx, network errors and timeouts
+        """
+        self.max_workers = max_workers
+        self.base_url = base_url
+        self.retries = retries
+        self.timeout = timeout
+        self.limiter = _WeightLimiter(weight_limit)
+
+    def _request(self, params) -> list:
+        url = f'{self.base_url}{KLINES_PATH}?{urllib.parse.urlencode(params)}'
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            try:
+                with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                    self.limiter.update(response.headers)
+                    return json.loads(response.read())
+            except urllib.error.HTTPError as error:
+                if attempt == self.retries:
+                    raise
+                if error.code in (418, 429):
+                    # 429: too many requests, 418: banned for ignoring 429s; both say how long to back off
+                    self.limiter.update(error.headers)
+                    self.limiter.pause(float(error.headers.get('Retry-After', 2 ** attempt)))
+                elif error.code >= 500:
+                    # binance failed or timed out itself, the same request may well succeed later
+                    time.sleep(2 ** attempt)
+                else:
+                    raise
+            except (urllib.error.URLError, socket.timeout):
+                # socket.timeout: the response was not read in `timeout` seconds
+                if attempt == self.retries:
+                    raise
+                time.sleep(2 ** attempt)
+
+    def _earliest_timestamp(self, symbol, interval) -> int:
+        first = self._request({'symbol': symbol, 'interval': interval, 'startTime': 0, 'limit': 1})
+        return first[0][0] if first else None
+
+    def _page(self, symbol, interval, start, end) -> list:
+        """
+        Sequential paging, for intervals without a fixed length
+        """
+        klines = []
+        while start <= end:
+            page = self._request({'symbol': symbol, 'interval': interval, 'limit': LIMIT, 'startTime': start,
+                                  'endTime': end})
+            klines += page
+            if len(page) < LIMIT:
+                break
+            start = page[-1][0] + 1
+        return klines
+
+    def get_historical_klines(self, symbol, interval, start_str=None, end_str=None) -> list:
+        """
+        Raw klines with open times from `start_str` to `end_str`, in order and without duplicates
+        :param start_str: date string or timestamp in ms, default -- listing of `symbol`
+        :param end_str: date string or timestamp in ms, default -- now
+        """
+        # binance.helpers pulls in dateparser, which takes most of a second to import
+        from binance.helpers import convert_ts_str, interval_to_milliseconds
+
+        step = interval_to_milliseconds(interval)
+        earliest = self._earliest_timestamp(symbol, interval)
+        if earliest is None:
+            return []
+        start = max(convert_ts_str(start_str) or 0, earliest)
+        end = convert_ts_str(end_str) if end_str is not None else int(time.time() * 1000)
+        if step is None:
+            return self._page(symbol, interval, start, end)
+
+        span = LIMIT * step
+        chunks = [{'symbol': symbol, 'interval': interval, 'limit': LIMIT,
+                   'startTime': chunk_start, 'endTime': min(chunk_start + span - 1, end)}
+                  for chunk_start in range(start, end + 1, span)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pages = list(executor.map(self._request, chunks))
+
+        klines = []
+        for page in pages:
+            for kline in page:
+                if not klines or kline[0] > klines[-1][0]:
+                    klines.append(kline)
+        return klines
@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def lttb(x, y, threshold) -> np.ndarray:
+    """
+    Indices of the `threshold` points of the line (x, y) kept by Largest-Triangle-Three-Buckets:
+    the first and last point, and from each of `threshold` - 2 equal buckets in between
+    the point making the largest triangle with the point kept before it and the mean of the next bucket.
+    NaN points are never kept.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.flatnonzero(~np.isnan(y))
+    n = finite.size
+    if threshold >= n or threshold < 3:
+        return finite
+    x = x[finite]
+    y = y[finite]
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    kept = np.empty(threshold, dtype=int)
+    kept[0] = 0
+    kept[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        # the next bucket, or the last point after the last bucket
+        next_stop = edges[i + 2] if i + 2 < edges.size else n
+        mean_x = x[stop:next_stop].mean()
+        mean_y = y[stop:next_stop].mean()
+        area = np.abs((x[a] - mean_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (mean_y - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return finite[kept]
+
+
+def downsample_ohlcv(time, open, high, low, close, volume, buckets) -> tuple:
+    """
+    Merge consecutive candles into at most `buckets` candles of (nearly) equal counts of candles,
+    like resampling to a longer timeframe: first open, highest high, lowest low, last close, total volume
+    """
+    n = len(time)
+    if buckets >= n:
+        return tuple(np.asarray(column) for column in (time, open, high, low, close, volume))
+    starts = np.linspace(0, n, buckets + 1).astype(int)[:-1]
+    ends = np.append(starts[1:], n) - 1
+    return (np.asarray(time)[starts], np.asarray(open)[starts],
+            np.fmax.reduceat(np.asarray(high, dtype=float), starts),
+            np.fmin.reduceat(np.asarray(low, dtype=float), starts),
+            np.asarray(close)[ends],
+            np.add.reduceat(np.nan_to_num(np.asarray(volume, dtype=float)), starts))
@@ -1,12 +1,35 @@
 import random
 
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from binance.client import Client
-from plotly.subplots import make_subplots
-from tabulate import tabulate
 import sys
-from indicators import ta, sep_window_ind
+from indicators import ROUNDING, ind_periods, sep_window_ind, warmup_bars, indicator_columns, compute_indicator
+from kernels import IndicatorContext
+from kline_cache import KlineCache, DEFAULT_CACHE_DIR
+from downloader import KlineDownloader
+from ingest import klines_to_frame
+from downsample import lttb, downsample_ohlcv
+from resample import bucket_start, next_bucket_start, nests, ResamplePyramid
+from output import print_table, export_frame
+from stats import stage
+
+
+# longest month, for timeframes without a fixed length
+MONTH_MS = 31 * 24 * 3600 * 1000
+
+
+# trace names of the columns of an indicator, by default its name in capitals
+ind_labels = {'macd': ['MACD', 'MACD Signal', 'MACD Difference'],
+              'bbands': ['Upper BB', 'Middle BB', 'Lower BB'],
+              'kc': ['Upper KC', 'Lower KC'],
+              'williams': ['Williams %R']}
+
+
+def indicator_stage(info) -> str:
+    """
+    Stats stage name of computing indicator `info`, e.g. 'indicator sma 20'
+    """
+    return ' '.join(['indicator'] + [str(param) for param in info])
 
 
 def random_color():
@@ -36,252 +59,295 @@ def calc_specs(wind_num):
 
 
 class Data:
-    def __init__(self, pair='DOGEUSDT', timeframe=Client.KLINE_INTERVAL_1DAY, start_date="1 Jan, 1900", end_date='now',
-                 indicators=[]):
+    def __init__(self, pair='DOGEUSDT', timeframe='1d', start_date="1 Jan, 1900", end_date='now',
+                 indicators=[], cache_dir=DEFAULT_CACHE_DIR, download_workers=1, max_points=None,
+                 stats=None, base_timeframe=None, dtype='float64'):
         """
         :param pair: str like 'DOGEUSDT', default -- DOGEUSDT
         :param timeframe: Client.KLINE_INTERVAL like Client.KLINE_INTERVAL_1DAY, default -- 1 day
         :param start_date: str like "1 Jan, 2000", default -- moment of listing of the chosen trading pair
         :param end_date: str like "1 Jan, 2000", default -- present
+        :param cache_dir: directory of the local kline cache, None to always download everything
+        :param download_workers: number of kline chunks downloaded concurrently by downloader.KlineDownloader
+        straight from the REST API, default -- 1: page sequentially through python-binance's Client
+        :param max_points: most points drawn per chart series, longer ones are downsampled and lines drawn with
+        WebGL; None -- draw every bar
+        :param stats: stats.Stats recording the time, rows and memory of every stage of this object's methods
+        :param base_timeframe: shorter timeframe like '1m' to download (and cache) instead of `timeframe`,
+        whose candles are then built from it; None -- download `timeframe` itself
+        :param dtype: dtype of the prices and volumes, and so of the indicators, 'float32' halves their memory
+        at a relative error of about 1e-6 to 1e-5 (see indicators.FLOAT32_TOLERANCE); the cache keeps float64
         """
         self.pair = pair
         self.timeframe = timeframe
         self.start_date = start_date
         self.end_date = end_date
         self.used_rows = 1
-        try:
-            self.client = Client('_', '_')
-        except:
-            print("\nCan not get data. Check your network connection.")
-            sys.exit()
-
-        wind_num = calc_wind_num(indicators)
-        self.fig = make_subplots(rows=wind_num, cols=1, row_heights=calc_row_heights(wind_num),
-                                 specs=calc_specs(wind_num))
-
-        klines = self.client.get_historical_klines(symbol=self.pair,
-                                                   interval=self.timeframe,
-                                                   start_str=self.start_date,
-                                                   end_str=self.end_date)
-
-        self.ohlcv = pd.DataFrame(klines,
-                                  columns=['time', 'open', 'high', 'low', 'close', 'volume',
-                                           'close_time', 'quote_asset_volume', 'number_of_trades',
-                                           'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume',
-                                           'ignore']).drop(
-            columns=['close_time', 'quote_asset_volume', 'number_of_trades', 'taker_buy_base_asset_volume',
-                     'taker_buy_quote_asset_volume', 'ignore'])
+        self.max_points = max_points
+        self.stats = stats
+        if base_timeframe is not None and not nests(timeframe, base_timeframe):
+            raise ValueError(f'{timeframe} candles can not be built from {base_timeframe} candles')
+        self.base_timeframe = base_timeframe
+        # the base candles and the candles of `timeframe` built from them, updated in place by `refresh`
+        self.pyramid = ResamplePyramid(base_timeframe, [timeframe]) if base_timeframe is not None else None
+        self.dtype = np.dtype(dtype)
+        self.indicators = []
+        # built on first use of `fig`, so compute-only use never creates any trace
+        self._fig = None
+        # plotly, binance and tabulate take over a second to import together, they are imported when first needed
+        from binance.helpers import convert_ts_str, interval_to_milliseconds
 
+        # the downloader pages the REST endpoint itself, a client (which pings binance when built) is only
+        # needed to page sequentially
+        self.client = None
+        if download_workers > 1:
+            self.source = KlineDownloader(max_workers=download_workers)
+        else:
+            from binance.client import Client
+
+            try:
+                self.client = Client('_', '_')
+            except:
+                print("\nCan not get data. Check your network connection.")
+                sys.exit()
+            self.source = self.client
+        self.cache = KlineCache(cache_dir) if cache_dir is not None else None
+
+        # fetch just enough bars before start_date for every indicator to be the same from the first shown bar
+        # as on the whole history, up to float64 rounding
+        start = convert_ts_str(self.start_date)
+        step = interval_to_milliseconds(self.timeframe) or MONTH_MS
+        history = self.load(start - warmup_bars(indicators, ROUNDING) * step, self.end_date)
+
+        # the warmup bars get negative labels: indicators are computed on them followed by `self.ohlcv`,
+        # and assigning them to `self.ohlcv` aligns on the index, which drops the warmup
+        history.index = np.arange(len(history)) - int((history['time'] < start).sum())
         # convert the timestamp column to datetime format
-        self.ohlcv['time'] = pd.to_datetime(self.ohlcv['time'], unit='ms')
-        cols = ['open', 'high', 'low', 'close', 'volume']
-        self.ohlcv[cols] = self.ohlcv[cols].apply(pd.to_numeric, errors='coerce', axis=1)
-
-        self.fig.add_trace(go.Candlestick(x=self.ohlcv['time'],
-                                          open=self.ohlcv['open'],
-                                          high=self.ohlcv['high'],
-                                          low=self.ohlcv['low'],
-                                          close=self.ohlcv['close'],
-                                          name='price'),
-                           row=1, col=1, secondary_y=True)
+        history['time'] = pd.to_datetime(history['time'], unit='ms')
+        # only the warmup is kept apart, the shown candles are stored once
+        self.warmup = history.loc[:-1].copy()
+        self.ohlcv = history.loc[0:].copy()
+        del history
+
         print(indicators)
-        for indicator in indicators:
-            self.add_indicator(indicator)
+        self._add_indicators(indicators)
+
+    def load(self, start, end) -> pd.DataFrame:
+        """
+        OHLCV frame of the candles opened from `start` to `end` (date strings or ms), `time` in ms
+        """
+        with self._stage('load') as record:
+            if self.base_timeframe is None:
+                ohlcv = self._fetch(self.timeframe, start, end)
+            else:
+                ohlcv = self._resampled(start, end)
+            record['rows'] = len(ohlcv)
+        return ohlcv.astype({column: self.dtype for column in ohlcv.columns if column != 'time'}, copy=False)
+
+    def _fetch(self, timeframe, start, end) -> pd.DataFrame:
+        if self.cache is not None:
+            return self.cache.load(self.source, self.pair, timeframe, start, end)
+        with stage('fetch') as fetched:
+            klines = self.source.get_historical_klines(symbol=self.pair,
+                                                       interval=timeframe,
+                                                       start_str=start,
+                                                       end_str=end)
+            fetched['rows'] = len(klines)
+        with stage('convert', rows=len(klines)):
+            return klines_to_frame(klines)
+
+    def _resampled(self, start, end) -> pd.DataFrame:
+        # the candles binance would return, built from the base candles of the same range
+        from binance.helpers import convert_ts_str
+
+        start, end = convert_ts_str(start), convert_ts_str(end)
+        first = int(bucket_start(start, self.timeframe))
+        if first < start:
+            first = next_bucket_start(first, self.timeframe)
+        base = self._fetch(self.base_timeframe, first, next_bucket_start(end, self.timeframe) - 1)
+        with stage('resample', rows=len(base)):
+            # only the candles the new base candles fall into are built again
+            self.pyramid.update({column: base[column].to_numpy() for column in base.columns})
+            candles = self.pyramid[self.timeframe]
+            if candles is None:
+                return pd.DataFrame({column: base[column].to_numpy()[:0] for column in base.columns})
+            time = candles['time']
+            shown = slice(np.searchsorted(time, first), np.searchsorted(time, end, side='right'))
+            # the pyramid's arrays are overwritten by later updates
+            return pd.DataFrame({column: values[shown].copy() for column, values in candles.items()})
+
+    def _stage(self, name, **fields):
+        # stages of this object are recorded in its own stats, if any, otherwise in the active one
+        return stage(name, self.stats, **fields)
+
+    def history(self) -> pd.DataFrame:
+        """
+        The candles with their warmup, indicators are computed on
+        """
+        return pd.concat([self.warmup, self.ohlcv[self.warmup.columns]])
 
     def add_indicator(self, info):
-        # Simple Moving Average 'SMA'
-        if info[0] == 'sma':
-            period = info[1]
-            self.ohlcv[f'sma_{period}'] = ta.SMA(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'sma_{period}'],
-                                          name=f'SMA {period}',
-                                          line=dict(width=2)), row=1, col=1, secondary_y=True)
-        # Simple Moving Median 'SMM'
-        elif info[0] == 'smm':
-            period = info[1]
-            self.ohlcv[f'smm_{period}'] = ta.SMM(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'smm_{period}'],
-                                          name=f'EMA {period}',
-                                          line=dict(width=2)), row=1, col=1, secondary_y=True)
-        # Smoothed Simple Moving Average 'SSMA'
-        elif info[0] == 'ssma':
-            period = info[1]
-            self.ohlcv[f'ssma_{period}'] = ta.SSMA(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'ssma_{period}'],
-                                          name=f'SSMA {period}',
-                                          line=dict(width=2)), row=1, col=1, secondary_y=True)
-        # Exponential Moving Average 'EMA'
-        elif info[0] == 'ema':
-            period = info[1]
-            self.ohlcv[f'ema_{period}'] = ta.EMA(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'ema_{period}'],
-                                          name=f'EMA {period}',
-                                          line=dict(width=2)), row=1, col=1, secondary_y=True)
-        # Double Exponential Moving Average 'DEMA'
-        elif info[0] == 'dema':
-            period = info[1]
-            self.ohlcv[f'dema_{period}'] = ta.DEMA(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'dema_{period}'],
-                                          name=f'DEMA {period}',
-                                          line=dict(width=2)), row=1, col=1, secondary_y=True)
-        # Triple Exponential Moving Average 'TEMA'
-        elif info[0] == 'tema':
-            period = info[1]
-            self.ohlcv[f'tema_{period}'] = ta.TEMA(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'tema_{period}'],
-                                          name=f'TEMA {period}',
-                                          line=dict(width=2)), row=1, col=1, secondary_y=True)
-        # Triangular Moving Average 'TRIMA'
-        elif info[0] == 'trima':
-            period = info[1]
-            self.ohlcv[f'trima_{period}'] = ta.TRIMA(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'trima_{period}'],
-                                          name=f'TRIMA {period}',
-                                          line=dict(width=2)), row=1, col=1, secondary_y=True)
-        elif info[0] == 'vama':
-            period = info[1]
-            self.ohlcv[f'vama_{period}'] = ta.VAMA(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'vama_{period}'],
-                                          name=f'VAMA {period}',
-                                          line=dict(width=2)), row=1, col=1, secondary_y=True)
-        elif info[0] == 'wma':
-            period = info[1]
-            self.ohlcv[f'wma_{period}'] = ta.WMA(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'wma_{period}'],
-                                          name=f'WMA {period}',
-                                          line=dict(width=2)), row=1, col=1, secondary_y=True)
-        elif info[0] == 'smma':
-            period = info[1]
-            self.ohlcv[f'smma_{period}'] = ta.SMMA(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'smma_{period}'],
-                                          name=f'SMMA {period}',
-                                          line=dict(width=2)),
-                               row=1, col=1, secondary_y=True)
-        elif info[0] == 'bbands':
-            period = info[1]
-            self.ohlcv[f'upper_bb_{period}'], self.ohlcv[f'middle_bb_{period}'], self.ohlcv[f'lower_bb_{period}'] = \
-                ta.BBANDS(self.ohlcv, period)
-            color = random_color()
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'upper_bb_{period}'],
-                                          name=f'Upper BB {period}',
-                                          line=dict(width=2, color=color)),
-                               row=1, col=1, secondary_y=True)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'middle_bb_{period}'],
-                                          name=f'Middle BB {period}',
-                                          line=dict(width=2, color=color)),
-                               row=1, col=1, secondary_y=True)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'lower_bb_{period}'],
-                                          name=f'Lower BB {period}',
-                                          line=dict(width=2, color=color)),
-                               row=1, col=1, secondary_y=True)
-
-        elif info[0] == 'macd':
-            fast = info[1]
-            slow = info[2]
-            self.ohlcv[f'macd_{fast}_{slow}'], self.ohlcv[f'macd_signal_{fast}_{slow}'], \
-                self.ohlcv[f'macd_difference_{fast}_{slow}'] = ta.MACD(self.ohlcv, period_fast=fast, period_slow=slow)
-
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'macd_{fast}_{slow}'],
-                                          name=f'MACD {fast} {slow}',
-                                          line=dict(width=2)),
-                               row=self.used_rows + 1, col=1)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'macd_signal_{fast}_{slow}'],
-                                          name=f'MACD Signal {fast} {slow}',
-                                          line=dict(width=2)),
-                               row=self.used_rows + 1, col=1)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'macd_difference_{fast}_{slow}'],
-                                          name=f'MACD Difference {fast} {slow}',
-                                          line=dict(width=2)),
-                               row=self.used_rows + 1, col=1)
-            self.used_rows += 1
+        """
+        :param info: list like ['sma', 10] or ['macd', 12, 26], see ind_periods
+        """
+        self._add_indicators([info])
 
-        elif info[0] == 'mom':
-            period = info[1]
-            self.ohlcv[f'mom_{period}'] = ta.MOM(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'mom_{period}'],
-                                          name=f'MOM {period}',
-                                          line=dict(width=2)),
-                               row=self.used_rows + 1, col=1)
-            self.used_rows += 1
+    def _add_indicators(self, infos):
+        history = self.history()
+        # intermediates are shared by these indicators only, and released with the history they were taken of
+        with IndicatorContext():
+            for info in infos:
+                if info[0].lower() not in ind_periods:
+                    print("This indicator is not available yet")
+                    continue
+                with self._stage(indicator_stage(info), rows=len(history)):
+                    for column, values in compute_indicator(info, history).items():
+                        self.ohlcv[column] = values
+                self.indicators.append(info)
+        # the chart may need another window, it is built again when next used
+        self._fig = None
 
-        elif info[0] == 'roc':
-            period = info[1]
-            self.ohlcv[f'roc_{period}'] = ta.ROC(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'roc_{period}'],
-                                          name=f'ROC {period}',
-                                          line=dict(width=2)),
-                               row=self.used_rows + 1, col=1)
-            self.used_rows += 1
+    @property
+    def fig(self):
+        """
+        Chart of the candles and all indicators, built on first use
+        """
+        if self._fig is None:
+            with self._stage('figure', rows=len(self.ohlcv)):
+                self._build_fig()
+        return self._fig
 
-        elif info[0] == 'rsi':
-            period = info[1]
-            self.ohlcv[f'rsi_{period}'] = ta.RSI(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'rsi_{period}'],
-                                          name=f'RSI {period}',
-                                          line=dict(width=2)),
-                               row=self.used_rows + 1, col=1)
-            self.used_rows += 1
+    def _build_fig(self):
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
 
-        elif info[0] == 'tr':
-            period = info[1]
-            self.ohlcv[f'tr_{period}'] = ta.TR(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'tr_{period}'],
-                                          name=f'TR {period}',
-                                          line=dict(width=2)),
-                               row=self.used_rows + 1, col=1)
-            self.used_rows += 1
+        wind_num = calc_wind_num(self.indicators)
+        self._fig = make_subplots(rows=wind_num, cols=1, row_heights=calc_row_heights(wind_num),
+                                  specs=calc_specs(wind_num))
+        self._fig.add_trace(go.Candlestick(name='price', meta='price', **self.trace_data('price')),
+                            row=1, col=1, secondary_y=True)
+        self.used_rows = 1
+        for info in self.indicators:
+            self.plot_indicator(info)
 
-        elif info[0] == 'atr':
-            period = info[1]
-            self.ohlcv[f'atr_{period}'] = ta.ATR(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'atr_{period}'],
-                                          name=f'ATR {period}',
-                                          line=dict(width=2)),
-                               row=self.used_rows + 1, col=1)
-            self.used_rows += 1
+    def plot_indicator(self, info):
+        import plotly.graph_objects as go
 
+        name, params = info[0].lower(), info[1:]
         # Volume
-        elif info[0] == 'volume':
-            self.fig.add_trace(go.Bar(x=self.ohlcv['time'], y=self.ohlcv['volume'],
-                                      name='volume', marker=dict(color='grey')),
+        if name == 'volume':
+            self.fig.add_trace(go.Bar(name='volume', marker=dict(color='grey'), meta='volume',
+                                      **self.trace_data('volume')),
                                row=1, col=1, secondary_y=False)
+            return
 
-        elif info[0] == 'KC':
-            period = info[1]
-            self.ohlcv[f'kc_up_{period}'], self.ohlcv[f'kc_down_{period}'] = ta.KC(self.ohlcv, period)
-            color = random_color()
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'kc_up_{period}'],
-                                          name=f'Upper KC {period}',
-                                          line=dict(width=2, color=color)),
-                               row=1, col=1, secondary_y=True)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'kc_down_{period}'],
-                                          name=f'Lower KC {period}',
-                                          line=dict(width=2, color=color)),
-                               row=1, col=1, secondary_y=True)
-
-        elif info[0] == 'stoch':
-            period = info[1]
-            self.ohlcv[f'stoch_{period}'] = ta.STOCH(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'stoch_{period}'],
-                                          name=f'STOCH {period}',
-                                          line=dict(width=2)),
-                               row=self.used_rows + 1, col=1)
+        columns = indicator_columns(info)
+        labels = ind_labels.get(name, [name.upper()])
+        separate = name in sep_window_ind
+        # the lines of a band share one color
+        color = random_color() if len(columns) > 1 and not separate else None
+        scatter = go.Scatter if self.max_points is None else go.Scattergl
+        for column, label in zip(columns, labels):
+            trace = scatter(name=' '.join([label] + [str(param) for param in params]), meta=column,
+                            line=dict(width=2, color=color), **self.trace_data(column))
+            if separate:
+                self.fig.add_trace(trace, row=self.used_rows + 1, col=1)
+            else:
+                self.fig.add_trace(trace, row=1, col=1, secondary_y=True)
+        if separate:
             self.used_rows += 1
 
-        elif info[0] == 'williams':
-            period = info[1]
-            self.ohlcv[f'williams_{period}'] = ta.WILLIAMS(self.ohlcv, period)
-            self.fig.add_trace(go.Scatter(x=self.ohlcv['time'], y=self.ohlcv[f'williams_{period}'],
-                                          name=f'Williams %R {period}',
-                                          line=dict(width=2)),
-                               row=self.used_rows + 1, col=1)
-            self.used_rows += 1
-        else:
-            print("This indicator is not available yet")
+    def refresh(self) -> int:
+        """
+        Append the candles opened since the last stored one, which is downloaded again as it may not have closed.
+        Indicators are recomputed over the new candles and their warmup only, chart traces are updated in place.
+        :return: number of new candles
+        """
+        history = self.history()
+        last = history['time'].iloc[-1].value // 1_000_000
+        new = self.load(last, 'now')
+        if new.empty:
+            return 0
+        new['time'] = pd.to_datetime(new['time'], unit='ms')
+        kept = history['time'] < new['time'].iloc[0]
+        first = history.index[kept][-1] + 1 if kept.any() else history.index[0]
+        new.index = np.arange(first, first + len(new))
+        history = pd.concat([history[kept], new])
+        self.warmup = history.loc[:-1].copy()
+        self.ohlcv = pd.concat([self.ohlcv.loc[:first - 1], new.loc[0:]])
+
+        tail = history.loc[first - warmup_bars(self.indicators, ROUNDING):]
+        del history
+        with IndicatorContext():
+            for info in self.indicators:
+                with self._stage(indicator_stage(info), rows=len(tail)):
+                    for column, values in compute_indicator(info, tail).items():
+                        self.ohlcv.loc[first:, column] = values.loc[first:]
+
+        if self._fig is not None:
+            with self._stage('figure update', rows=len(self.ohlcv)), self._fig.batch_update():
+                for trace in self._fig.data:
+                    trace.update(self.trace_data(trace.meta))
+        return len(new) - int((~kept).sum())
+
+    def trace_data(self, meta, ohlcv=None) -> dict:
+        """
+        Data of the chart trace of `meta` ('price', 'volume' or an indicator column) for the rows of `ohlcv`,
+        by default all of them, downsampled to `max_points`
+        """
+        ohlcv = self.ohlcv if ohlcv is None else ohlcv
+        if self.max_points is None or len(ohlcv) <= self.max_points:
+            if meta == 'price':
+                return dict(x=ohlcv['time'], open=ohlcv['open'], high=ohlcv['high'], low=ohlcv['low'],
+                            close=ohlcv['close'])
+            return dict(x=ohlcv['time'], y=ohlcv[meta])
+        if meta in ('price', 'volume'):
+            # merged candles, as if the chart were of a longer timeframe
+            columns = [ohlcv[column].to_numpy() for column in ['time', 'open', 'high', 'low', 'close', 'volume']]
+            time, open, high, low, close, volume = downsample_ohlcv(*columns, self.max_points)
+            if meta == 'price':
+                return dict(x=time, open=open, high=high, low=low, close=close)
+            return dict(x=time, y=volume)
+        time = ohlcv['time'].to_numpy()
+        values = ohlcv[meta].to_numpy()
+        kept = lttb(time.astype('datetime64[ms]').astype(np.int64), values, self.max_points)
+        return dict(x=time[kept], y=values[kept])
+
+    def chart_widget(self):
+        """
+        The chart as a plotly FigureWidget (needs ipywidgets) that downsamples again for the visible range
+        on every zoom, so zooming in shows more detail
+        """
+        import plotly.graph_objects as go
+
+        widget = go.FigureWidget(self.fig)
+
+        def zoom(layout, x_range):
+            ohlcv = self.ohlcv
+            if x_range is not None:
+                visible = (ohlcv['time'] >= pd.Timestamp(x_range[0])) & (ohlcv['time'] <= pd.Timestamp(x_range[1]))
+                ohlcv = ohlcv[visible]
+            with widget.batch_update():
+                for trace in widget.data:
+                    trace.update(self.trace_data(trace.meta, ohlcv))
 
-    def beauty_print_data(self):
-        print(tabulate(self.ohlcv, headers='keys', tablefmt='psql'))
-        print(self.ohlcv.shape)
+        widget.layout.on_change(zoom, 'xaxis.range')
+        return widget
+
+    def beauty_print_data(self, head=None, tail=None, page=None, page_size=1000, stream=None):
+        """
+        Print `ohlcv` as tables of `page_size` rows, see output.print_table for the options
+        """
+        with self._stage('print', rows=len(self.ohlcv)):
+            print_table(self.ohlcv, stream=stream, head=head, tail=tail, page=page, page_size=page_size)
+        print(self.ohlcv.shape, file=stream)
+
+    def export(self, path):
+        """
+        Write `ohlcv` to a .csv (.csv.gz, ...) or .parquet file
+        """
+        with self._stage('export', rows=len(self.ohlcv)):
+            export_frame(self.ohlcv, path)
 
     def print_data(self):
         print(self.ohlcv)
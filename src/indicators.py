@@ -1,6 +1,13 @@
+import functools
+import math
+from contextvars import ContextVar
+
 import numpy as np
 import pandas as pd
 
+import kernels
+from stats import active_stats, stage
+
 ind_periods = {'volume': 0,
                'sma': 1,
                'smm': 1,
@@ -26,91 +33,245 @@ ind_periods = {'volume': 0,
 
 sep_window_ind = ['macd', 'mom', 'roc', 'rsi', 'tr', 'atr', 'stoch', 'williams', 'trix']
 
-
+# EMA based indicators never stop depending on older bars, their warmup ends
+# once those bars weigh less than EWM_TOLERANCE of the value
+EWM_TOLERANCE = 1e-4
+# the tolerance below which leaving older bars out changes an EMA less than its float64 rounding
+ROUNDING = 2.0 ** -53
+
+
+# the tolerance warmup_bars was called with
+_ewm_tolerance = ContextVar('ewm_tolerance', default=EWM_TOLERANCE)
+
+
+def _ewm_warmup(alpha, levels=1) -> int:
+    return levels * math.ceil(math.log(_ewm_tolerance.get()) / math.log(1 - alpha)) if alpha < 1 else 0
+
+
+# bars of history an indicator needs before a bar for its value there to be valid,
+# called with the parameters of the indicator as given in ind_periods
+ind_warmup = {'volume': lambda: 0,
+              'sma': lambda period: period - 1,
+              'smm': lambda period: period - 1,
+              'ssma': lambda period: _ewm_warmup(1 / period),
+              'ema': lambda period: _ewm_warmup(2 / (period + 1)),
+              'dema': lambda period: _ewm_warmup(2 / (period + 1), levels=2),
+              'tema': lambda period: _ewm_warmup(2 / (period + 1), levels=3),
+              'trima': lambda period: 2 * period - 2,
+              'trix': lambda period: _ewm_warmup(2 / (period + 1), levels=3) + 1,
+              'vama': lambda period: 2 * period - 2,
+              'wma': lambda period: period - 1,
+              'smma': lambda period: _ewm_warmup(1 / period),
+              'macd': lambda fast, slow: _ewm_warmup(2 / (max(fast, slow) + 1)) + _ewm_warmup(2 / (9 + 1)),
+              'mom': lambda period: period,
+              'roc': lambda period: period,
+              'rsi': lambda period: _ewm_warmup(1 / period) + 1,
+              'tr': lambda: 1,
+              'atr': lambda period: period,
+              'bbands': lambda period: period - 1,
+              'kc': lambda period: max(_ewm_warmup(2 / (period + 1)), 10),
+              'stoch': lambda period: period - 1,
+              'williams': lambda period: period - 1}
+
+
+def warmup_bars(indicators, tolerance=EWM_TOLERANCE) -> int:
+    """
+    Bars of history needed before the first bar for all `indicators` to be valid there
+    :param indicators: list like [['sma', 10], ['macd', 12, 26]]
+    :param tolerance: weight below which older bars are ignored by EMA based indicators
+    """
+    token = _ewm_tolerance.set(tolerance)
+    try:
+        return max([ind_warmup[info[0].lower()](*info[1:]) for info in indicators], default=0)
+    finally:
+        _ewm_tolerance.reset(token)
+
+
+# largest error of an indicator computed on float32 data (see Data's dtype) against float64 on the same data,
+# relative to the largest magnitude of the indicator: found on random walks of up to 1e6 bars and periods
+# up to 1000 with a fivefold margin. It does not grow with the length of the data: EMAs are run in float64
+# whatever the data, and rolling sums and deviations are only ever accumulated over one window.
+# Rounding float64 data to float32 first moves every value by up to 6e-8 of itself, which the indicators
+# pass on like any change of the data: a lot, relatively, to differences of close prices like TR or STOCH
+FLOAT32_TOLERANCE = {'sma': 1e-5,
+                     'smm': 1e-6,
+                     'ssma': 1e-6,
+                     'ema': 1e-6,
+                     'dema': 1e-6,
+                     'tema': 1e-6,
+                     'trima': 1e-5,
+                     'trix': 1e-6,
+                     'vama': 1e-5,
+                     'wma': 1e-5,
+                     'smma': 1e-6,
+                     'macd': 1e-6,
+                     'mom': 1e-6,
+                     'roc': 1e-6,
+                     'rsi': 1e-6,
+                     'tr': 1e-6,
+                     'atr': 1e-5,
+                     'bbands': 1e-5,
+                     'kc': 1e-6,
+                     'stoch': 1e-6,
+                     'williams': 1e-6}
+
+
+def make_panel(frames, index='time') -> pd.DataFrame:
+    """
+    Align one OHLCV frame per symbol on their `index` column into a panel with (field, symbol) columns.
+    Rows a symbol has no candle for, e.g. before it was listed, are NaN.
+    :param frames: dict like {'DOGEUSDT': ohlcv, 'BTCUSDT': ohlcv}
+    """
+    panel = pd.concat({symbol: frame.set_index(index) for symbol, frame in frames.items()}, axis=1,
+                      names=['symbol', 'field'])
+    return panel.swaplevel(axis=1).sort_index(axis=1)
+
+
+# Every `ta` method also takes a panel: a DataFrame with (field, symbol) columns as built by `make_panel`
+# gives one column per symbol, and a dict of bars x symbols arrays gives bars x symbols arrays.
+# All symbols are computed in one vectorized pass.
+# They also take Arrow tables and record batches and Polars frames, read through NumPy views of their columns
+# (copied only when a column has nulls or several chunks), and give one-column tables, record batches and frames
+# named like the pandas series, or with one column per period for sweeps, over the results without copying them.
+
+def _library(ohlc):
+    # 'pyarrow' or 'polars' for their tables, None for anything else, without importing either
+    library = type(ohlc).__module__.split('.')[0]
+    return library if library in ('pyarrow', 'polars') else None
+
+
+def _values(ohlc, column) -> np.ndarray:
+    library = _library(ohlc)
+    if library == 'pyarrow':
+        values = ohlc.column(column)
+        if hasattr(values, 'chunks'):
+            values = values.chunk(0) if values.num_chunks == 1 else values.combine_chunks()
+        return kernels._as_array(values.to_numpy(zero_copy_only=False))
+    if library == 'polars':
+        return kernels._as_array(ohlc.get_column(column).to_numpy())
+    return kernels._as_array(ohlc[column])
+
+
+def _ma_values(MA):
+    if MA is not None and _library(MA) is not None:
+        # the one-column result of a `ta` method
+        return _values(MA, MA.columns[0] if _library(MA) == 'polars' else MA.column_names[0])
+    return None if MA is None else kernels._as_array(MA)
+
+
+def _table(columns, ohlc, names):
+    # a table of the library of `ohlc` over the arrays `columns`
+    if _library(ohlc) == 'polars':
+        import polars
+
+        return polars.DataFrame([polars.Series(name, column) for name, column in zip(names, columns)])
+    import pyarrow
+
+    return type(ohlc).from_arrays([pyarrow.array(column) for column in columns], names=names)
+
+
+def _series(data, ohlc, name):
+    if _library(ohlc) is not None:
+        return _table([data], ohlc, [name])
+    if not isinstance(ohlc, pd.DataFrame):
+        return data
+    if data.ndim == 1:
+        return pd.Series(data=data, index=ohlc.index, dtype=data.dtype, name=name)
+    return pd.DataFrame(data=data, index=ohlc.index, columns=ohlc[ohlc.columns[0][0]].columns, dtype=data.dtype)
+
+
+def _frame(data, ohlc, periods) -> pd.DataFrame:
+    if _library(ohlc) is not None:
+        # one contiguous row per period, which each column then views
+        return _table(np.ascontiguousarray(data.T), ohlc, [str(period) for period in periods])
+    if not isinstance(ohlc, pd.DataFrame):
+        return data
+    if data.ndim == 2:
+        columns = pd.Index(periods, name='period')
+    else:
+        # a panel gives one column per symbol and period
+        columns = pd.MultiIndex.from_product([ohlc[ohlc.columns[0][0]].columns, periods], names=['symbol', 'period'])
+    return pd.DataFrame(data=data.reshape(len(data), -1), index=ohlc.index, columns=columns, dtype=data.dtype)
+
+
+def _rows(ohlc) -> int:
+    return len(next(iter(ohlc.values()))) if isinstance(ohlc, dict) else len(ohlc)
+
+
+def _recorded(cls):
+    """
+    Record every call of a classmethod of `cls` as stage '<cls>.<method>' of the active Stats, if any
+    """
+    def record(name, method):
+        @functools.wraps(method)
+        def wrapper(cls, *args, **kwargs):
+            if active_stats() is None:
+                return method(cls, *args, **kwargs)
+            # the data is the first argument, passed as `ohlc` or `ohlcv`
+            with stage(name, rows=_rows(args[0] if args else kwargs.get('ohlc', kwargs.get('ohlcv')))):
+                return method(cls, *args, **kwargs)
+
+        return wrapper
+
+    for name, method in list(vars(cls).items()):
+        if isinstance(method, classmethod):
+            setattr(cls, name, classmethod(record(f'{cls.__name__}.{name}', method.__func__)))
+    return cls
+
+
+@_recorded
 class ta:
+    # Every method is a thin wrapper over the ndarray kernels in `kernels`.
+    # Calls made inside `with IndicatorContext():` share intermediates such as EMAs, TR and rolling max/min.
+
     @classmethod
     def SMA(cls, ohlc, period=10, column='close') -> pd.Series:
         """
         Simple moving average
         """
-        return pd.Series(
-            data=ohlc[column].rolling(window=period).mean(),
-            dtype=float,
-            name=f'{period} period SMA'
-        )
+        return _series(kernels.sma(_values(ohlc, column), period), ohlc, f'{period} period SMA')
 
     @classmethod
     def SMM(cls, ohlc, period=10, column='close') -> pd.Series:
         """
         Simple moving median, an alternative to moving average
         """
-        return pd.Series(
-            data=ohlc[column].rolling(window=period).median(),
-            dtype=float,
-            name=f'{period} period SMM'
-        )
+        return _series(kernels.smm(_values(ohlc, column), period), ohlc, f'{period} period SMM')
 
     @classmethod
     def SSMA(cls, ohlc, period=10, column='close', adjust=True) -> pd.Series:
         """
         Smoothed simple moving average
         """
-        return pd.Series(
-            ohlc[column].ewm(ignore_na=False, alpha=1.0 / period, min_periods=0, adjust=adjust).mean(),
-            dtype=float,
-            name=f'{period} period SSMA'
-        )
+        return _series(kernels.ssma(_values(ohlc, column), period, adjust), ohlc, f'{period} period SSMA')
 
     @classmethod
     def EMA(cls, ohlc, period=10, column='close', adjust=True) -> pd.Series:
         """
         Exponential Moving Average
         """
-        return pd.Series(
-            data=ohlc[column].ewm(span=period, adjust=adjust).mean(),
-            dtype=float,
-            name=f'{period} period EMA'
-        )
+        return _series(kernels.ema(_values(ohlc, column), period, adjust), ohlc, f'{period} period EMA')
 
     @classmethod
     def DEMA(cls, ohlc, period=10, column='close', adjust=True) -> pd.Series:
         """
         Double Exponential Moving Average
         """
-        return pd.Series(
-            data=2 * cls.EMA(ohlc, period, column) - cls.EMA(ohlc, period, column).ewm(span=period,
-                                                                                       adjust=adjust).mean(),
-            dtype=float,
-            name=f'{period} period DEMA'
-        )
+        return _series(kernels.dema(_values(ohlc, column), period, adjust), ohlc, f'{period} period DEMA')
 
     @classmethod
     def TEMA(cls, ohlc, period=10, column='close', adjust=True) -> pd.Series:
         """
         Triple exponential moving average
         """
-        triple_ema = 3 * cls.EMA(ohlc, period, column)
-        ema_ema_ema = (
-            cls.EMA(ohlc, period, column).
-            ewm(ignore_na=False, span=period, adjust=adjust).mean().
-            ewm(ignore_na=False, span=period, adjust=adjust).mean()
-        )
-        return pd.Series(
-            data=triple_ema - 3 * cls.EMA(ohlc, period, column).ewm(span=period, adjust=adjust).mean() + ema_ema_ema,
-            dtype=float,
-            name=f'{period} period TEMA'
-        )
+        return _series(kernels.tema(_values(ohlc, column), period, adjust), ohlc, f'{period} period TEMA')
 
     @classmethod
     def TRIMA(cls, ohlc, period=10, column='close') -> pd.Series:
         """
         Triangular Moving Average
         """
-        return pd.Series(
-            data=cls.SMA(ohlc, period, column).rolling(window=period).sum() / period,
-            dtype=float,
-            name=f'{period} period TRIMA'
-        )
+        return _series(kernels.trima(_values(ohlc, column), period), ohlc, f'{period} period TRIMA')
 
     @classmethod
     def TRIX(cls, ohlc, period=10, column='close', adjust=True) -> pd.Series:
@@ -118,66 +279,29 @@ class ta:
         The TRIX indicator calculates the rate of change of a triple exponential moving average.
         The values oscillate around zero. Buy/sell signals are generated when the TRIX crosses above/below zero.
         """
-        data = ohlc[column]
-
-        def _ema(data, period, adjust):
-            return pd.Series(data.ewm(span=period, adjust=adjust).mean())
-
-        m = _ema(_ema(_ema(data, period, adjust), period, adjust), period, adjust)
-        return pd.Series(
-            data=100 * (m.diff() / m),
-            dtype=float,
-            name=f'{period} period TRIX'
-        )
+        return _series(kernels.trix(_values(ohlc, column), period, adjust), ohlc, f'{period} period TRIX')
 
     @classmethod
     def VAMA(cls, ohlcv, period=10, column='close') -> pd.Series:
         """
         Volume Adjusted Moving Average
         """
-        vp = ohlcv['volume'] * ohlcv[column]
-        vol_sum = ohlcv['volume'].rolling(window=period).mean()
-        vol_ratio = pd.Series(vp / vol_sum, name="VAMA")
-        cum_sum = (vol_ratio * ohlcv[column]).rolling(window=period).sum()
-        cum_div = vol_ratio.rolling(window=period).sum()
-
-        return pd.Series(
-            data=cum_sum / cum_div,
-            dtype=float,
-            name=f'{period} period VAMA'
-        )
+        return _series(kernels.vama(_values(ohlcv, column), _values(ohlcv, 'volume'), period), ohlcv,
+                       f'{period} period VAMA')
 
     @classmethod
     def WMA(cls, ohlc, period=10, column='close') -> pd.Series:
         """
         Weighted moving average
         """
-        denominator = (period * (period + 1)) / 2
-        weights = np.arange(1, period + 1)
-
-        def linear(w):
-            def _compute(x):
-                return (w * x).sum() / denominator
-
-            return _compute
-
-        _close = ohlc[column].rolling(period, min_periods=period)
-        return pd.Series(
-            data=_close.apply(linear(weights), raw=True),
-            dtype=float,
-            name=f'{period} period WMA',
-        )
+        return _series(kernels.wma(_values(ohlc, column), period), ohlc, f'{period} period WMA')
 
     @classmethod
     def SMMA(cls, ohlc, period=10, column='close', adjust=True) -> pd.Series:
         """
         Smoothed Moving Average gives recent prices an equal weighting to historic prices.
         """
-        return pd.Series(
-            data=ohlc[column].ewm(alpha=1 / period, adjust=adjust).mean(),
-            dtype=float,
-            name=f'{period} period SMMA'
-        )
+        return _series(kernels.smma(_values(ohlc, column), period, adjust), ohlc, f'{period} period SMMA')
 
     @classmethod
     def MACD(cls, ohlc, period_fast=12, period_slow=26, signal=9, column='close', adjust=True) \
@@ -185,70 +309,31 @@ class ta:
         """
         MACD, MACD Signal and MACD difference
         """
-        EMA_fast = pd.Series(
-            ohlc[column].ewm(ignore_na=False, span=period_fast, adjust=adjust).mean(),
-            dtype=float,
-            name='EMA_fast'
-        )
-        EMA_slow = pd.Series(
-            ohlc[column].ewm(ignore_na=False, span=period_slow, adjust=adjust).mean(),
-            dtype=float,
-            name='EMA_slow'
-        )
-        MACD = pd.Series(
-            EMA_fast - EMA_slow,
-            dtype=float,
-            name='MACD'
-        )
-        MACD_signal = pd.Series(
-            MACD.ewm(ignore_na=False, span=signal, adjust=adjust).mean(),
-            dtype=float,
-            name='SIGNAL'
-        )
-        MACD_difference = MACD - MACD_signal
-        return [MACD, MACD_signal, MACD_difference]
+        MACD, MACD_signal, MACD_difference = kernels.macd(_values(ohlc, column), period_fast, period_slow, signal,
+                                                          adjust)
+        return [_series(MACD, ohlc, 'MACD'), _series(MACD_signal, ohlc, 'SIGNAL'),
+                _series(MACD_difference, ohlc, 'MACD_DIFF')]
 
     @classmethod
     def MOM(cls, ohlc, period=10, column='close') -> pd.Series:
         """
         Market momentum
         """
-        return pd.Series(
-            data=ohlc[column].diff(period),
-            dtype=float,
-            name=f'{period} period MOM'
-        )
+        return _series(kernels.mom(_values(ohlc, column), period), ohlc, f'{period} period MOM')
 
     @classmethod
     def ROC(cls, ohlc, period=10, column='close') -> pd.Series:
         """
         The Rate-of-Change indicator
         """
-        return pd.Series(
-            data=(ohlc[column].diff(period) / ohlc[column].shift(period)) * 100,
-            dtype=float,
-            name='ROC'
-        )
+        return _series(kernels.roc(_values(ohlc, column), period), ohlc, 'ROC')
 
     @classmethod
     def RSI(cls, ohlc, period=10, column='close', adjust=True) -> pd.Series:
         """
         Relative Strength Index
         """
-        delta = ohlc[column].diff()
-        up, down = delta.copy(), delta.copy()
-        up[up < 0] = 0
-        down[down > 0] = 0
-
-        # EMAs of ups and downs
-        _gain = up.ewm(alpha=1.0 / period, adjust=adjust).mean()
-        _loss = down.abs().ewm(alpha=1.0 / period, adjust=adjust).mean()
-        RS = _gain / _loss
-        return pd.Series(
-            data=100 - (100 / (1 + RS)),
-            dtype=float,
-            name=f'{period} period RSI'
-        )
+        return _series(kernels.rsi(_values(ohlc, column), period, adjust), ohlc, f'{period} period RSI')
 
     @classmethod
     def TR(cls, ohlc) -> pd.Series:
@@ -258,86 +343,116 @@ class ta:
         Absolute value of the most recent period's high minus the previous close.
         Absolute value of the most recent period's low minus the previous close.
         """
-        TR1 = pd.Series(ohlc['high'] - ohlc['low']).abs()
-        TR2 = pd.Series(ohlc['high'] - ohlc['close'].shift()).abs()
-        TR3 = pd.Series(ohlc['close'].shift() - ohlc['low']).abs()
-        _TR = pd.concat([TR1, TR2, TR3], axis=1)
-        _TR['TR'] = _TR.max(axis=1)
-        return pd.Series(
-            data=_TR['TR'],
-            dtype=float,
-            name='TR'
-        )
+        return _series(kernels.tr(_values(ohlc, 'high'), _values(ohlc, 'low'), _values(ohlc, 'close')), ohlc, 'TR')
 
     @classmethod
     def ATR(cls, ohlc, period=10) -> pd.Series:
         """
         Average True Range is moving average of True Range.
         """
-        TR = cls.TR(ohlc)
-        return pd.Series(
-            data=TR.rolling(center=False, window=period).mean(),
-            dtype=float,
-            name=f'{period} period ATR'
-        )
+        return _series(kernels.atr(_values(ohlc, 'high'), _values(ohlc, 'low'), _values(ohlc, 'close'), period),
+                       ohlc, f'{period} period ATR')
 
     @classmethod
     def BBANDS(cls, ohlc, period=14, MA=None, column="close", std_multiplier=2) -> [pd.Series, pd.Series, pd.Series]:
         """
          Bollinger Bands
          """
-
-        std = ohlc[column].rolling(window=period).std()
-        if not isinstance(MA, pd.Series):
-            middle_band = pd.Series(cls.SMA(ohlc, period), dtype=float, name='BB_MIDDLE')
-        else:
-            middle_band = pd.Series(MA, dtype=float, name='BB_MIDDLE')
-
-        upper_bb = pd.Series(middle_band + (std_multiplier * std), dtype=float, name='BB_UPPER')
-        lower_bb = pd.Series(middle_band - (std_multiplier * std), dtype=float, name='BB_LOWER')
-        return [upper_bb, middle_band, lower_bb]
+        upper_bb, middle_band, lower_bb = kernels.bbands(_values(ohlc, column), period, _ma_values(MA),
+                                                         std_multiplier)
+        return [_series(upper_bb, ohlc, 'BB_UPPER'), _series(middle_band, ohlc, 'BB_MIDDLE'),
+                _series(lower_bb, ohlc, 'BB_LOWER')]
 
     @classmethod
     def KC(cls, ohlc, period=20, atr_period=10, MA=None, kc_mult=2) -> [pd.Series, pd.Series]:
         """
         Keltner Channels
         """
-        if not isinstance(MA, pd.Series):
-            middle = pd.Series(cls.EMA(ohlc, period), dtype=float, name='KC_MIDDLE')
-        else:
-            middle = pd.Series(MA, dtype=float, name='KC_MIDDLE')
-
-        up = pd.Series(middle + (kc_mult * cls.ATR(ohlc, atr_period)), dtype=float, name='KC_UPPER')
-        down = pd.Series(middle - (kc_mult * cls.ATR(ohlc, atr_period)), dtype=float, name='KC_LOWER')
-        return [up, down]
+        up, down = kernels.kc(_values(ohlc, 'high'), _values(ohlc, 'low'), _values(ohlc, 'close'), period,
+                              atr_period, _ma_values(MA), kc_mult)
+        return [_series(up, ohlc, 'KC_UPPER'), _series(down, ohlc, 'KC_LOWER')]
 
     @classmethod
     def STOCH(cls, ohlc, period=14) -> pd.Series:
         """
         Stochastic oscillator %K
         """
-
-        highest_high = ohlc['high'].rolling(center=False, window=period).max()
-        lowest_low = ohlc['low'].rolling(center=False, window=period).min()
-        stoch = pd.Series(
-            data=(ohlc['close'] - lowest_low) / (highest_high - lowest_low) * 100,
-            dtype=float,
-            name=f'{period} period STOCH %K',
-        )
-        return stoch
+        return _series(kernels.stoch(_values(ohlc, 'high'), _values(ohlc, 'low'), _values(ohlc, 'close'), period),
+                       ohlc, f'{period} period STOCH %K')
 
     @classmethod
     def WILLIAMS(cls, ohlc, period=14) -> pd.Series:
         """
         Williams %R
         """
+        return _series(kernels.williams(_values(ohlc, 'high'), _values(ohlc, 'low'), _values(ohlc, 'close'), period),
+                       ohlc, f'{period} Williams %R')
 
-        highest_high = ohlc['high'].rolling(center=False, window=period).max()
-        lowest_low = ohlc['low'].rolling(center=False, window=period).min()
-        wr = pd.Series(
-            data=(highest_high - ohlc["close"]) / (highest_high - lowest_low),
-            dtype=float,
-            name=f'{period} Williams %R',
-        )
+    @classmethod
+    def SMA_sweep(cls, ohlc, periods, column='close') -> pd.DataFrame:
+        """
+        Simple moving average for every period in `periods`, one column per period
+        """
+        periods = list(periods)
+        return _frame(kernels.sma_sweep(_values(ohlc, column), periods), ohlc, periods)
 
-        return wr * -100
+    @classmethod
+    def EMA_sweep(cls, ohlc, periods, column='close', adjust=True) -> pd.DataFrame:
+        """
+        Exponential Moving Average for every period in `periods`, one column per period
+        """
+        periods = list(periods)
+        return _frame(kernels.ema_sweep(_values(ohlc, column), periods, adjust), ohlc, periods)
+
+    @classmethod
+    def RSI_sweep(cls, ohlc, periods, column='close', adjust=True) -> pd.DataFrame:
+        """
+        Relative Strength Index for every period in `periods`, one column per period
+        """
+        periods = list(periods)
+        return _frame(kernels.rsi_sweep(_values(ohlc, column), periods, adjust), ohlc, periods)
+
+    @classmethod
+    def BBANDS_sweep(cls, ohlc, periods, column='close', std_multiplier=2) \
+            -> [pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Bollinger Bands for every period in `periods`: upper, middle and lower band frames, one column per period
+        """
+        periods = list(periods)
+        upper_bb, middle_band, lower_bb = kernels.bbands_sweep(_values(ohlc, column), periods, std_multiplier)
+        return [_frame(upper_bb, ohlc, periods), _frame(middle_band, ohlc, periods), _frame(lower_bb, ohlc, periods)]
+
+
+ind_methods = {'sma': ta.SMA, 'smm': ta.SMM, 'ssma': ta.SSMA, 'ema': ta.EMA, 'dema': ta.DEMA, 'tema': ta.TEMA,
+               'trima': ta.TRIMA, 'trix': ta.TRIX, 'vama': ta.VAMA, 'wma': ta.WMA, 'smma': ta.SMMA,
+               'macd': lambda ohlc, fast, slow: ta.MACD(ohlc, period_fast=fast, period_slow=slow),
+               'mom': ta.MOM, 'roc': ta.ROC, 'rsi': ta.RSI, 'tr': ta.TR, 'atr': ta.ATR, 'bbands': ta.BBANDS,
+               'kc': ta.KC, 'stoch': ta.STOCH, 'williams': ta.WILLIAMS}
+
+
+def indicator_columns(info) -> list:
+    """
+    Names of the columns indicator `info` is stored in, e.g. ['sma_10'] for ['sma', 10]
+    """
+    name, params = info[0].lower(), info[1:]
+    if name == 'volume':
+        return []
+    if name == 'macd':
+        fast, slow = params
+        return [f'macd_{fast}_{slow}', f'macd_signal_{fast}_{slow}', f'macd_difference_{fast}_{slow}']
+    if name == 'bbands':
+        return [f'upper_bb_{params[0]}', f'middle_bb_{params[0]}', f'lower_bb_{params[0]}']
+    if name == 'kc':
+        return [f'kc_up_{params[0]}', f'kc_down_{params[0]}']
+    return ['_'.join([name] + [str(param) for param in params])]
+
+
+def compute_indicator(info, ohlc) -> dict:
+    """
+    Columns of indicator `info`, e.g. ['macd', 12, 26], computed on `ohlc`: {column name: pd.Series}
+    """
+    name = info[0].lower()
+    if name == 'volume':
+        return {}
+    result = ind_methods[name](ohlc, *info[1:])
+    return dict(zip(indicator_columns(info), result if isinstance(result, list) else [result]))
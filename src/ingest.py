@@ -0,0 +1,37 @@
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+# positions of the columns we keep in a raw binance kline
+# [open time, open, high, low, close, volume, close time, quote asset volume, number of trades, ...]
+columns = {'time': 0, 'open': 1, 'high': 2, 'low': 3, 'close': 4, 'volume': 5}
+
+
+def _floats(klines, position) -> np.ndarray:
+    column = map(itemgetter(position), klines)
+    try:
+        return np.fromiter(map(float, column), dtype=float, count=len(klines))
+    except (TypeError, ValueError):
+        # same as pd.to_numeric(errors='coerce'): anything that is not a number becomes NaN
+        return pd.to_numeric(pd.Series(list(map(itemgetter(position), klines)), dtype=object),
+                             errors='coerce').to_numpy(dtype=float)
+
+
+def klines_to_columns(klines) -> dict:
+    """
+    Raw klines as returned by binance into one typed array per column, `time` as int64 ms.
+    Reads each kept column straight out of the kline lists, the other columns are never copied.
+    """
+    data = {'time': np.fromiter(map(itemgetter(columns['time']), klines), dtype=np.int64, count=len(klines))}
+    for column, position in columns.items():
+        if column != 'time':
+            data[column] = _floats(klines, position)
+    return data
+
+
+def klines_to_frame(klines) -> pd.DataFrame:
+    """
+    OHLCV frame of raw klines, `time` as int64 ms
+    """
+    return pd.DataFrame(klines_to_columns(klines), copy=False)
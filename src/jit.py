@@ -0,0 +1,50 @@
+import numba
+import numpy as np
+
+# Numba-compiled loops, imported by `kernels` on first use when numba is installed.
+# They run the recursion of pandas ``ewm(...).mean()`` (see streaming._EWM) and give the same results bit for bit.
+
+
+@numba.njit(cache=True)
+def _ewm_levels(values, alphas, adjust, levels):
+    n, columns = values.shape
+    out = np.empty((levels, n, columns))
+    # the state of every level and column, rows are visited in memory order
+    weighted = np.full((levels, columns), np.nan)
+    old_wt = np.ones((levels, columns))
+    nobs = np.zeros((levels, columns), dtype=np.int64)
+    for i in range(n):
+        for j in range(columns):
+            factor = 1.0 - alphas[j]
+            new_wt = 1.0 if adjust else alphas[j]
+            value = values[i, j]
+            for level in range(levels):
+                is_observation = value == value
+                nobs[level, j] += is_observation
+                if weighted[level, j] == weighted[level, j]:
+                    old_wt[level, j] *= factor
+                    if is_observation:
+                        if weighted[level, j] != value:
+                            weighted[level, j] = (old_wt[level, j] * weighted[level, j] + new_wt * value) / \
+                                                 (old_wt[level, j] + new_wt)
+                        if adjust:
+                            old_wt[level, j] += new_wt
+                        else:
+                            old_wt[level, j] = 1.0
+                elif is_observation:
+                    weighted[level, j] = value
+                value = weighted[level, j] if nobs[level, j] else np.nan
+                out[level, i, j] = value
+    return out
+
+
+def ewm_levels(values, com, adjust=True, levels=1) -> np.ndarray:
+    """
+    Exponentially weighted mean of `values` along the first axis, the mean of that and so on, in one pass:
+    an array of `levels` results. `com` may be an array broadcasting against the trailing axes, one per column.
+    """
+    shape = np.broadcast_shapes(values.shape, (1,) + np.shape(com))
+    flat = np.ascontiguousarray(np.broadcast_to(values, shape).reshape(shape[0], -1), dtype=float)
+    alphas = np.ascontiguousarray(np.broadcast_to(1.0 / (1.0 + np.asarray(com, dtype=float)), shape[1:]),
+                                  dtype=float).reshape(-1)
+    return _ewm_levels(flat, alphas, bool(adjust), levels).reshape((levels,) + shape)
@@ -0,0 +1,636 @@
+import functools
+import importlib.util
+import inspect
+from contextvars import ContextVar
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from pandas._libs.window.aggregations import ewm as _pandas_ewm
+
+from streaming import _span_com, _alpha_com
+
+# ndarray-in / ndarray-out versions of every indicator in `ta`.
+# Time runs along the first axis and results have the same length as the input,
+# NaN wherever the pandas implementation gives NaN.
+
+
+# EWM recursions over at least JIT_MIN_SIZE values run as compiled loops from `jit` when numba is installed,
+# smaller ones are not worth importing numba for; set JIT to False to use numpy only
+JIT = importlib.util.find_spec('numba') is not None
+JIT_MIN_SIZE = 10_000
+
+
+def _as_array(values) -> np.ndarray:
+    # float32 data is computed and returned as float32, anything else as float64
+    values = np.asarray(values)
+    return values if values.dtype == np.float32 else values.astype(float, copy=False)
+
+
+def _in_float64(kernel):
+    """
+    Run `kernel` on float64 data and round its results back to the dtype of the data, for kernels
+    subtracting EMAs, whose float32 values would cancel each other down to a few significant digits
+    """
+    @functools.wraps(kernel)
+    def wrapper(close, *args, **kwargs):
+        close = _as_array(close)
+        if close.dtype == np.float64:
+            return kernel(close, *args, **kwargs)
+        out = kernel(close.astype(float), *args, **kwargs)
+        return tuple(part.astype(close.dtype) for part in out) if isinstance(out, tuple) else out.astype(close.dtype)
+    return wrapper
+
+
+_active_context = ContextVar('indicator_context', default=None)
+
+
+class IndicatorContext:
+    """
+    Cache of the intermediates (EMAs, true range, rolling mean/std/max/min) computed while it is active,
+    so composite and sibling indicators on the same data compute each of them once:
+
+        with IndicatorContext():
+            ema, dema, tema = ta.EMA(ohlcv, 14), ta.DEMA(ohlcv, 14), ta.TEMA(ohlcv, 14)
+
+    Entries are keyed by the memory of the input arrays and the parameters,
+    so the data must not be modified in place while the context holds results for it.
+    Cached results are read-only.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._tokens = []
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        self._tokens.append(_active_context.set(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_context.reset(self._tokens.pop())
+
+    def clear(self):
+        self._results.clear()
+
+    def _get(self, key, arguments, compute) -> np.ndarray:
+        if key in self._results:
+            self.hits += 1
+            return self._results[key][0]
+        self.misses += 1
+        result = compute()
+        result.flags.writeable = False
+        # the arguments are kept alive so that their memory, which the key refers to, is not reused
+        self._results[key] = (result, arguments)
+        return result
+
+
+def _argument_key(argument):
+    if isinstance(argument, np.ndarray):
+        return argument.__array_interface__['data'][0], argument.shape, argument.strides, argument.dtype.str
+    return argument
+
+
+def _shared(func):
+    """
+    Look up results of `func` in the active IndicatorContext, if any
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        context = _active_context.get()
+        if context is None:
+            return func(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__name__,) + tuple(_argument_key(argument) for argument in bound.args)
+        try:
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+        return context._get(key, bound.args, lambda: func(*args, **kwargs))
+
+    return wrapper
+
+
+def _blocks(values, period) -> np.ndarray:
+    """
+    Zero-pad `values` to a whole number of blocks and reshape to (blocks, period, ...)
+    """
+    n = values.shape[0]
+    padding = -n % period
+    if padding:
+        values = np.concatenate([values, np.zeros((padding,) + values.shape[1:], dtype=values.dtype)])
+    return values.reshape((-1, period) + values.shape[1:])
+
+
+def _window_sums(blocks, n, previous=None) -> np.ndarray:
+    """
+    Trailing window sums from a (blocks, period, ...) array: every window is a prefix of one block
+    plus what is left of the block before it (taken from `previous` when given)
+    """
+    sums = np.cumsum(blocks, axis=1)
+    sums[1:, :-1] += _suffix_sums(blocks if previous is None else previous)
+    return _unblock(sums, n)
+
+
+def _suffix_sums(blocks) -> np.ndarray:
+    """
+    Sums of each block but the last from row j + 1 to its end, for every row j but the last
+    """
+    return np.cumsum(blocks[:-1, :0:-1], axis=1)[:, ::-1]
+
+
+def _unblock(blocks, n) -> np.ndarray:
+    return blocks.reshape((-1,) + blocks.shape[2:])[:n]
+
+
+def _block_sums(blocks, previous=None) -> (np.ndarray, np.ndarray):
+    """
+    Sums from the start of its block to every row, and from every row to the end of its block
+    (taken from `previous` when given)
+    """
+    previous = blocks if previous is None else previous
+    return np.cumsum(blocks, axis=1), np.cumsum(previous[:, ::-1], axis=1)[:, ::-1]
+
+
+def _swept_window_sums(prefix, suffix, period, n) -> np.ndarray:
+    """
+    Trailing window sums of any period up to the block length from `_block_sums`: a window either lies inside
+    one block (difference of two prefixes) or is a suffix of the previous block plus a prefix of the current one
+    """
+    block = prefix.shape[1]
+    sums = np.empty(prefix.shape, dtype=prefix.dtype)
+    sums[:, period:] = prefix[:, period:] - prefix[:, :block - period]
+    sums[:, period - 1] = prefix[:, period - 1]
+    sums[1:, :period - 1] = prefix[1:, :period - 1] + suffix[:-1, block - period + 1:]
+    sums[0, :period - 1] = np.nan
+    return _unblock(sums, n)
+
+
+def _stack_periods(columns, shape) -> np.ndarray:
+    """
+    Stack per-period results on a last axis, stored period-major so every column is contiguous
+    """
+    out = np.empty((len(columns),) + shape, dtype=np.result_type(*columns))
+    for i, column in enumerate(columns):
+        out[i] = column
+    return np.moveaxis(out, 0, -1)
+
+
+def _mask_incomplete(out, missing, period):
+    """
+    Set NaN where the window is not full yet or holds a missing value, as pandas does with min_periods=period
+    """
+    out[:period - 1] = np.nan
+    if missing is not None:
+        counts = np.cumsum(missing, axis=0)
+        counts[period:] -= counts[:-period].copy()
+        out[counts > 0] = np.nan
+    return out
+
+
+def _fill_missing(values):
+    missing = np.isnan(values)
+    if not missing.any():
+        return values, None
+    return np.where(missing, 0.0, values), missing
+
+
+def _rolling_sum(values, period) -> np.ndarray:
+    """
+    Sum over trailing windows of `period` rows in O(n) for any period.
+    Sums are accumulated inside blocks of `period` rows only,
+    so no long running sum (and its rounding error) is ever formed.
+    """
+    values = _as_array(values)
+    n = values.shape[0]
+    if period > n:
+        return np.full(values.shape, np.nan, dtype=values.dtype)
+    filled, missing = _fill_missing(values)
+    return _mask_incomplete(_window_sums(_blocks(filled, period), n), missing, period)
+
+
+@_shared
+def _rolling_mean(values, period) -> np.ndarray:
+    out = _rolling_sum(values, period)
+    out /= period
+    return out
+
+
+@_shared
+def _rolling_std(values, period) -> np.ndarray:
+    """
+    Sample standard deviation over trailing windows of `period` rows.
+    Deviations are taken from the first value of the newest block, which every window contains,
+    so the sums of squares stay well conditioned whatever the price level.
+    """
+    values = _as_array(values)
+    n = values.shape[0]
+    if period > n or period < 2:
+        return np.full(values.shape, np.nan, dtype=values.dtype)
+    filled, missing = _fill_missing(values)
+    blocks = _blocks(filled, period)
+    shift = blocks[:, :1]
+    current = blocks - shift
+    previous = np.zeros_like(blocks)
+    previous[:-1] = blocks[:-1] - shift[1:]
+    sum_x = _window_sums(current, n, previous)
+    sum_xx = _window_sums(current * current, n, previous * previous)
+    variance = (sum_xx - sum_x * sum_x / period) / (period - 1)
+    return _mask_incomplete(np.sqrt(np.maximum(variance, 0.0)), missing, period)
+
+
+def _rolling_apply(values, period, func, budget=1 << 22) -> np.ndarray:
+    """
+    Apply a reduction over every trailing window, in slices of at most `budget` window elements
+    """
+    values = _as_array(values)
+    out = np.full(values.shape, np.nan, dtype=values.dtype)
+    if period > values.shape[0]:
+        return out
+    windows = sliding_window_view(values, period, axis=0)
+    step = max(1, budget // period)
+    for start in range(0, windows.shape[0], step):
+        out[period - 1 + start:period - 1 + start + step] = func(windows[start:start + step], axis=-1)
+    return out
+
+
+def _rolling_extreme(values, period, ufunc) -> np.ndarray:
+    """
+    Rolling max or min (`ufunc` np.maximum or np.minimum) in O(n) for any period, as van Herk/Gil-Werman:
+    every window is a suffix of one block of `period` rows plus a prefix of the next,
+    whose extremes are running maxima/minima inside the blocks. NaN propagates like in np.max.
+    """
+    values = _as_array(values)
+    n = values.shape[0]
+    if period > n:
+        return np.full(values.shape, np.nan, dtype=values.dtype)
+    blocks = _blocks(values, period)
+    out = ufunc.accumulate(blocks, axis=1)
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1]
+    out[1:, :-1] = ufunc(suffix[:-1, 1:], out[1:, :-1])
+    out = _unblock(out, n)
+    out[:period - 1] = np.nan
+    return out
+
+
+@_shared
+def _rolling_max(values, period) -> np.ndarray:
+    return _rolling_extreme(values, period, np.maximum)
+
+
+@_shared
+def _rolling_min(values, period) -> np.ndarray:
+    return _rolling_extreme(values, period, np.minimum)
+
+
+# windows longer than this go through pandas' own rolling median (an O(n log period) skiplist), as `ta.SMM` always
+# did; shorter ones are faster partitioned in place by np.median (1e6 bars, period 5: 0.14s against pandas' 0.36s)
+MEDIAN_SKIPLIST_PERIOD = 20
+
+
+def _rolling_median(values, period) -> np.ndarray:
+    values = _as_array(values)
+    if period <= MEDIAN_SKIPLIST_PERIOD or period > values.shape[0]:
+        return _rolling_apply(values, period, np.median)
+    columns = pd.DataFrame(values.reshape(values.shape[0], -1))
+    return columns.rolling(period).median().to_numpy(dtype=values.dtype).reshape(values.shape)
+
+
+def _shift(values, periods=1) -> np.ndarray:
+    out = np.full(values.shape, np.nan, dtype=values.dtype)
+    if periods < values.shape[0]:
+        out[periods:] = values[:values.shape[0] - periods]
+    return out
+
+
+def _diff(values, periods=1) -> np.ndarray:
+    return values - _shift(values, periods)
+
+
+def _ewm(values, com, adjust=True) -> np.ndarray:
+    """
+    Exponentially weighted mean with pandas ``ewm(com=com, adjust=adjust).mean()`` semantics, by its very
+    recursion (pandas' own compiled loop, or the JIT one), so the streaming objects replaying it give the same values
+    bit for bit. `com` may be an array broadcasting against the trailing axes of `values`, one per column.
+    """
+    values = _as_array(values)
+    if values.dtype != np.float64:
+        # the recursion runs over the whole history, it is kept in float64 whatever the data
+        return _ewm(values.astype(float), com, adjust).astype(values.dtype)
+    if JIT and values.size * np.size(com) >= JIT_MIN_SIZE:
+        from jit import ewm_levels
+        return ewm_levels(values, com, adjust)[0]
+    shape = np.broadcast_shapes(values.shape, (1,) + np.shape(com))
+    values = np.broadcast_to(values, shape)
+    coms = np.broadcast_to(com, shape[1:])
+    # the bounds of the single window pandas' ExponentialMovingWindowIndexer gives
+    start, end = np.zeros(1, dtype=np.int64), np.full(1, shape[0], dtype=np.int64)
+    # time last, so that every column is written contiguously
+    out = np.empty(shape[1:] + shape[:1])
+    for column in np.ndindex(shape[1:]):
+        out[column] = _pandas_ewm(values[(slice(None),) + column], start, end, 1, float(coms[column]), adjust, False)
+    return np.moveaxis(out, -1, 0)
+
+
+@_shared
+def _span_ewm(values, span, adjust=True) -> np.ndarray:
+    return _ewm(values, _span_com(span), adjust)
+
+
+@_shared
+def _alpha_ewm(values, alpha, adjust=True) -> np.ndarray:
+    return _ewm(values, _alpha_com(alpha), adjust)
+
+
+def _span_ewm_chain(values, span, adjust, levels) -> list:
+    """
+    EMA of `values`, the EMA of that and so on: `levels` arrays.
+    The JIT backend computes them in one pass, unless an IndicatorContext may already hold some levels.
+    """
+    values = _as_array(values)
+    if JIT and values.size >= JIT_MIN_SIZE and _active_context.get() is None:
+        from jit import ewm_levels
+        return list(ewm_levels(values, _span_com(span), adjust, levels).astype(values.dtype, copy=False))
+    chain = [_span_ewm(values, span, adjust)]
+    while len(chain) < levels:
+        chain.append(_span_ewm(chain[-1], span, adjust))
+    return chain
+
+
+def _ewm_sweep(values, coms, adjust=True) -> np.ndarray:
+    """
+    `_ewm` for several centres of mass at once, one column per com appended as the last axis
+    """
+    return _ewm(_as_array(values)[..., None], np.asarray(coms, dtype=float), adjust)
+
+
+def sma(close, period=10) -> np.ndarray:
+    """
+    Simple moving average
+    """
+    return _rolling_mean(close, period)
+
+
+def smm(close, period=10) -> np.ndarray:
+    """
+    Simple moving median
+    """
+    return _rolling_median(close, period)
+
+
+def ssma(close, period=10, adjust=True) -> np.ndarray:
+    """
+    Smoothed simple moving average
+    """
+    return _alpha_ewm(close, 1.0 / period, adjust)
+
+
+def ema(close, period=10, adjust=True) -> np.ndarray:
+    """
+    Exponential Moving Average
+    """
+    return _span_ewm(close, period, adjust)
+
+
+@_in_float64
+def dema(close, period=10, adjust=True) -> np.ndarray:
+    """
+    Double Exponential Moving Average
+    """
+    ema_1, ema_2 = _span_ewm_chain(close, period, adjust, 2)
+    return 2 * ema_1 - ema_2
+
+
+@_in_float64
+def tema(close, period=10, adjust=True) -> np.ndarray:
+    """
+    Triple exponential moving average
+    """
+    ema_1, ema_2, ema_3 = _span_ewm_chain(close, period, adjust, 3)
+    return 3 * ema_1 - 3 * ema_2 + ema_3
+
+
+def trima(close, period=10) -> np.ndarray:
+    """
+    Triangular Moving Average
+    """
+    return _rolling_sum(_rolling_mean(close, period), period) / period
+
+
+@_in_float64
+def trix(close, period=10, adjust=True) -> np.ndarray:
+    """
+    Rate of change of a triple exponential moving average, in percent
+    """
+    m = _span_ewm_chain(close, period, adjust, 3)[-1]
+    return 100 * (_diff(m) / m)
+
+
+def vama(close, volume, period=10) -> np.ndarray:
+    """
+    Volume Adjusted Moving Average
+    """
+    close = _as_array(close)
+    volume = _as_array(volume)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vol_ratio = volume * close / _rolling_mean(volume, period)
+        return _rolling_sum(vol_ratio * close, period) / _rolling_sum(vol_ratio, period)
+
+
+def wma(close, period=10) -> np.ndarray:
+    """
+    Weighted moving average
+    """
+    values = _as_array(close)
+    n = values.shape[0]
+    if period > n:
+        return np.full(values.shape, np.nan, dtype=values.dtype)
+    filled, missing = _fill_missing(values)
+    blocks = _blocks(filled, period)
+    # row j of a block is (j + 1) rows in, the window ending there weights it `period`
+    # and weights row q of the block before with q - j
+    position = np.arange(1, period + 1, dtype=values.dtype).reshape((1, -1) + (1,) * (values.ndim - 1))
+    weighted = blocks * position
+    sums = np.cumsum(weighted, axis=1) + (period - position) * np.cumsum(blocks, axis=1)
+    sums[1:, :-1] += _suffix_sums(weighted) - position[:, :-1] * _suffix_sums(blocks)
+    out = _unblock(sums, n) / ((period * (period + 1)) / 2)
+    return _mask_incomplete(out, missing, period)
+
+
+def smma(close, period=10, adjust=True) -> np.ndarray:
+    """
+    Smoothed Moving Average
+    """
+    return _alpha_ewm(close, 1 / period, adjust)
+
+
+@_in_float64
+def macd(close, period_fast=12, period_slow=26, signal=9, adjust=True) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    MACD, MACD Signal and MACD difference
+    """
+    macd_line = _span_ewm(close, period_fast, adjust) - _span_ewm(close, period_slow, adjust)
+    macd_signal = _span_ewm(macd_line, signal, adjust)
+    return macd_line, macd_signal, macd_line - macd_signal
+
+
+def mom(close, period=10) -> np.ndarray:
+    """
+    Market momentum
+    """
+    return _diff(_as_array(close), period)
+
+
+def roc(close, period=10) -> np.ndarray:
+    """
+    The Rate-of-Change indicator
+    """
+    close = _as_array(close)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (_diff(close, period) / _shift(close, period)) * 100
+
+
+def rsi(close, period=10, adjust=True) -> np.ndarray:
+    """
+    Relative Strength Index
+    """
+    delta = _diff(_as_array(close))
+    up = np.where(delta < 0, 0.0, delta)
+    down = np.abs(np.where(delta > 0, 0.0, delta))
+    gain = _alpha_ewm(up, 1.0 / period, adjust)
+    loss = _alpha_ewm(down, 1.0 / period, adjust)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+
+@_shared
+def tr(high, low, close) -> np.ndarray:
+    """
+    True Range
+    """
+    high = _as_array(high)
+    low = _as_array(low)
+    prev_close = _shift(_as_array(close))
+    return np.fmax(np.fmax(np.abs(high - low), np.abs(high - prev_close)), np.abs(prev_close - low))
+
+
+def atr(high, low, close, period=10) -> np.ndarray:
+    """
+    Average True Range
+    """
+    return _rolling_mean(tr(high, low, close), period)
+
+
+def bbands(close, period=14, ma=None, std_multiplier=2) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Bollinger Bands: upper, middle and lower band
+    """
+    middle = _rolling_mean(close, period) if ma is None else _as_array(ma)
+    width = std_multiplier * _rolling_std(close, period)
+    return middle + width, middle, middle - width
+
+
+def kc(high, low, close, period=20, atr_period=10, ma=None, kc_mult=2) -> (np.ndarray, np.ndarray):
+    """
+    Keltner Channels: upper and lower channel
+    """
+    middle = _span_ewm(close, period) if ma is None else _as_array(ma)
+    width = kc_mult * atr(high, low, close, atr_period)
+    return middle + width, middle - width
+
+
+def stoch(high, low, close, period=14) -> np.ndarray:
+    """
+    Stochastic oscillator %K
+    """
+    highest_high = _rolling_max(high, period)
+    lowest_low = _rolling_min(low, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (_as_array(close) - lowest_low) / (highest_high - lowest_low) * 100
+
+
+def williams(high, low, close, period=14) -> np.ndarray:
+    """
+    Williams %R
+    """
+    highest_high = _rolling_max(high, period)
+    lowest_low = _rolling_min(low, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (highest_high - _as_array(close)) / (highest_high - lowest_low) * -100
+
+
+def sma_sweep(close, periods) -> np.ndarray:
+    """
+    Simple moving average for every period in `periods`, one column per period.
+    All periods share one set of block sums.
+    """
+    values = _as_array(close)
+    n = values.shape[0]
+    filled, missing = _fill_missing(values)
+    sums = _block_sums(_blocks(filled, max(periods)))
+    return _stack_periods([_mask_incomplete(_swept_window_sums(*sums, period, n), missing, period) / period
+                           for period in periods], values.shape)
+
+
+def ema_sweep(close, periods, adjust=True) -> np.ndarray:
+    """
+    Exponential Moving Average for every period in `periods`, one column per period
+    """
+    return _ewm_sweep(close, [_span_com(period) for period in periods], adjust)
+
+
+def rsi_sweep(close, periods, adjust=True) -> np.ndarray:
+    """
+    Relative Strength Index for every period in `periods`, one column per period.
+    Price changes are split into gains and losses once for all periods.
+    """
+    delta = _diff(_as_array(close))
+    up = np.where(delta < 0, 0.0, delta)
+    down = np.abs(np.where(delta > 0, 0.0, delta))
+    coms = [_alpha_com(1.0 / period) for period in periods]
+    gain = _ewm_sweep(up, coms, adjust)
+    loss = _ewm_sweep(down, coms, adjust)
+    # 100 - (100 / (1 + gain / loss)) without temporaries the size of the whole sweep
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(gain, loss, out=gain)
+    gain += 1
+    np.divide(100, gain, out=gain)
+    return np.subtract(100, gain, out=gain)
+
+
+def bbands_sweep(close, periods, std_multiplier=2) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Bollinger Bands for every period in `periods`: upper, middle and lower band, one column per period.
+    All periods share one set of block sums of prices and of squared deviations.
+    """
+    values = _as_array(close)
+    n = values.shape[0]
+    filled, missing = _fill_missing(values)
+    blocks = _blocks(filled, max(periods))
+    shift = blocks[:, :1]
+    current = blocks - shift
+    previous = np.zeros_like(blocks)
+    previous[:-1] = blocks[:-1] - shift[1:]
+    sums = _block_sums(blocks)
+    deviations = _block_sums(current, previous)
+    squares = _block_sums(current * current, previous * previous)
+
+    middles, widths = [], []
+    for period in periods:
+        middles.append(_mask_incomplete(_swept_window_sums(*sums, period, n), missing, period) / period)
+        if period < 2:
+            widths.append(np.full(values.shape, np.nan, dtype=values.dtype))
+            continue
+        sum_x = _swept_window_sums(*deviations, period, n)
+        sum_xx = _swept_window_sums(*squares, period, n)
+        spread = sum_xx - sum_x * sum_x / period
+        # windows inside a block are not centred on one of their own prices, so equal prices leave rounding noise
+        spread[spread <= 1e-14 * sum_xx] = 0.0
+        widths.append(std_multiplier * _mask_incomplete(np.sqrt(spread / (period - 1)), missing, period))
+    middle = _stack_periods(middles, values.shape)
+    width = _stack_periods(widths, values.shape)
+    return middle + width, middle, middle - width
@@ -0,0 +1,114 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from ingest import klines_to_columns
+from stats import stage
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'technical_indicators')
+
+columns = ['time', 'open', 'high', 'low', 'close', 'volume']
+
+
+def _concat(parts) -> dict:
+    """
+    Merge column dicts into one sorted by time, later parts winning on equal times
+    """
+    data = {column: np.concatenate([part[column] for part in parts]) for column in columns}
+    # a stable sort keeps equal times in part order, the last of each run is the newest
+    order = np.argsort(data['time'], kind='stable')
+    times = data['time'][order]
+    keep = np.append(times[1:] != times[:-1], True)
+    return {column: values[order][keep] for column, values in data.items()}
+
+
+class KlineCache:
+    """
+    Klines of every pair/timeframe downloaded so far, one .npz file per pair/timeframe in `directory`.
+    Each file covers one contiguous range of open times; only the parts of a request outside it are downloaded.
+    Candles that have not closed yet are returned but never stored.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = directory
+
+    def path(self, pair, timeframe) -> str:
+        return os.path.join(self.directory, f'{pair}_{timeframe}.npz')
+
+    def read(self, pair, timeframe) -> (dict, (int, int)):
+        """
+        Cached columns and the covered range of open times in ms, or (None, None)
+        """
+        with stage('cache read') as record:
+            try:
+                with np.load(self.path(pair, timeframe)) as stored:
+                    data = {column: stored[column] for column in columns}
+                    covered = tuple(int(t) for t in stored['covered'])
+            except (OSError, KeyError, ValueError):
+                return None, None
+            record['rows'] = len(data['time'])
+            return data, covered
+
+    def write(self, pair, timeframe, data, covered):
+        with stage('cache write', rows=len(data['time'])):
+            self._write(pair, timeframe, data, covered)
+
+    def _write(self, pair, timeframe, data, covered):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(pair, timeframe)
+        # write next to the target and rename, so an interrupted run never leaves a broken file
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as file:
+            np.savez(file, covered=np.array(covered, dtype=np.int64), **data)
+        os.replace(temporary, path)
+
+    def load(self, client, pair, timeframe, start_date="1 Jan, 1900", end_date='now') -> pd.DataFrame:
+        """
+        OHLCV frame for `pair`/`timeframe` between `start_date` and `end_date`, `time` in ms.
+        Dates are date strings or timestamps in ms.
+        Missing leading/trailing ranges are downloaded with `client.get_historical_klines` and merged into the cache.
+        """
+        from binance.helpers import convert_ts_str, interval_to_milliseconds
+
+        start = convert_ts_str(start_date)
+        end = convert_ts_str(end_date)
+        step = interval_to_milliseconds(timeframe)
+        if step is None:
+            # month candles have no fixed length, so the covered range can not be tracked
+            return pd.DataFrame(self._fetch(client, pair, timeframe, start, end))
+
+        data, covered = self.read(pair, timeframe)
+        if data is None:
+            parts = [self._fetch(client, pair, timeframe, start, end)]
+            covered_from, covered_to = start, end
+        else:
+            # requests that do not touch the cached range are extended to it, so it stays contiguous
+            parts = [data]
+            covered_from, covered_to = covered
+            if start < covered_from:
+                parts.append(self._fetch(client, pair, timeframe, start, covered_from - 1))
+                covered_from = start
+            if end > covered_to:
+                parts.append(self._fetch(client, pair, timeframe, covered_to + 1, end))
+                covered_to = end
+        data = _concat(parts)
+
+        if len(parts) > 1 or covered is None:
+            # a candle opened later than this has not closed yet
+            last_closed = int(time.time() * 1000) - step
+            stored = data['time'] <= last_closed
+            self.write(pair, timeframe, {column: values[stored] for column, values in data.items()},
+                       (covered_from, min(covered_to, last_closed)))
+
+        selected = (data['time'] >= start) & (data['time'] <= end)
+        return pd.DataFrame({column: values[selected] for column, values in data.items()})
+
+    @staticmethod
+    def _fetch(client, pair, timeframe, start, end) -> dict:
+        with stage('fetch') as record:
+            klines = client.get_historical_klines(symbol=pair, interval=timeframe, start_str=start, end_str=end)
+            record['rows'] = len(klines)
+        with stage('convert', rows=len(klines)):
+            return klines_to_columns(klines)
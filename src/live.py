@@ -0,0 +1,179 @@
+import queue
+
+import numpy as np
+import pandas as pd
+
+from indicators import warmup_bars, indicator_columns, compute_indicator
+from streaming import StreamingSMA, StreamingSMM, StreamingSSMA, StreamingEMA, StreamingDEMA, StreamingTEMA, \
+    StreamingTRIX, StreamingSMMA, StreamingRSI, StreamingTR, StreamingATR, StreamingMACD, StreamingBBANDS, \
+    StreamingKC, StreamingSTOCH, StreamingWILLIAMS
+
+ohlcv_columns = ['open', 'high', 'low', 'close', 'volume']
+
+# indicators with an O(1) streaming version, fed either the close or (high, low, close);
+# the others are computed over their warmup of most recent bars
+streaming_ind = {'sma': (StreamingSMA, 'close'),
+                 'smm': (StreamingSMM, 'close'),
+                 'ssma': (StreamingSSMA, 'close'),
+                 'ema': (StreamingEMA, 'close'),
+                 'dema': (StreamingDEMA, 'close'),
+                 'tema': (StreamingTEMA, 'close'),
+                 'trix': (StreamingTRIX, 'close'),
+                 'smma': (StreamingSMMA, 'close'),
+                 'rsi': (StreamingRSI, 'close'),
+                 'macd': (StreamingMACD, 'close'),
+                 'bbands': (StreamingBBANDS, 'close'),
+                 'tr': (StreamingTR, 'hlc'),
+                 'atr': (StreamingATR, 'hlc'),
+                 'kc': (StreamingKC, 'hlc'),
+                 'stoch': (StreamingSTOCH, 'hlc'),
+                 'williams': (StreamingWILLIAMS, 'hlc')}
+
+
+class RingBuffer:
+    """
+    The last `capacity` rows of a table of float columns plus an int64 `time` column, in fixed memory
+    """
+
+    def __init__(self, capacity, columns):
+        self.capacity = capacity
+        self.columns = list(columns)
+        self.time = np.zeros(capacity, dtype=np.int64)
+        self.values = np.full((capacity, len(self.columns)), np.nan)
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, time, row):
+        position = self.count % self.capacity
+        self.time[position] = time
+        self.values[position] = row
+        self.count += 1
+
+    def _order(self, last=None) -> np.ndarray:
+        size = len(self) if last is None else min(last, len(self))
+        return np.arange(self.count - size, self.count) % self.capacity
+
+    def latest(self, last=None) -> np.ndarray:
+        """
+        Values of the `last` rows (all by default), oldest first
+        """
+        return self.values[self._order(last)]
+
+    def frame(self, last=None) -> pd.DataFrame:
+        """
+        The `last` rows (all by default), oldest first, time as datetime
+        """
+        order = self._order(last)
+        frame = pd.DataFrame(self.values[order], columns=self.columns)
+        frame.insert(0, 'time', pd.to_datetime(self.time[order], unit='ms'))
+        return frame
+
+
+class LiveData:
+    """
+    OHLCV and indicator columns of one pair following a kline stream, keeping only the last `capacity` bars.
+    Indicators take the same `info` lists as `Data`, e.g. [['sma', 20], ['macd', 12, 26]],
+    and are updated once per closed candle. Those without a streaming version are computed over the last bars,
+    as many as their warmup, which must fit in `capacity`.
+    """
+
+    def __init__(self, pair='DOGEUSDT', timeframe='1m', indicators=[], capacity=1000):
+        self.pair = pair
+        self.timeframe = timeframe
+        self.indicators = [list(info) for info in indicators]
+        self.columns = [column for info in self.indicators for column in indicator_columns(info)]
+        # bars the window computed indicators look back over
+        self._window = warmup_bars([info for info in self.indicators if info[0].lower() not in streaming_ind]) + 1
+        if self._window > capacity:
+            raise ValueError(f'indicators computed over a window need the last {self._window} bars, '
+                             f'more than capacity={capacity}')
+        self.buffer = RingBuffer(capacity, ohlcv_columns + self.columns)
+        self._streaming = [self._make_streaming(info) for info in self.indicators]
+        self.last_time = None
+
+    @staticmethod
+    def _make_streaming(info):
+        name = info[0].lower()
+        if name not in streaming_ind:
+            return None
+        cls, _ = streaming_ind[name]
+        return cls(*info[1:])
+
+    @property
+    def ohlcv(self) -> pd.DataFrame:
+        return self.buffer.frame()
+
+    def update(self, time, open, high, low, close, volume):
+        """
+        Add one closed candle, `time` being its open time in ms
+        """
+        if self.last_time is not None and time <= self.last_time:
+            return
+        self.last_time = time
+        row = [open, high, low, close, volume]
+        # indicators computed over a window see this candle as their last row
+        self.buffer.append(time, row + [np.nan] * len(self.columns))
+        window = None
+        for info, indicator in zip(self.indicators, self._streaming):
+            name = info[0].lower()
+            if indicator is not None:
+                value = indicator.update(close) if streaming_ind[name][1] == 'close' else \
+                    indicator.update(high, low, close)
+                row += list(value) if isinstance(value, tuple) else [value]
+            elif name != 'volume':
+                if window is None:
+                    window = pd.DataFrame(self.buffer.latest(self._window)[:, :len(ohlcv_columns)],
+                                          columns=ohlcv_columns)
+                row += [series.iloc[-1] for series in compute_indicator(info, window).values()]
+        self.buffer.values[(self.buffer.count - 1) % self.buffer.capacity] = row
+
+    def seed(self, ohlcv):
+        """
+        Run the candles of a history frame, e.g. `Data.ohlcv`, through the indicators
+        """
+        times = pd.to_datetime(ohlcv['time']).to_numpy().astype('datetime64[ms]').astype(np.int64)
+        for time, *row in zip(times.tolist(), *(ohlcv[column].tolist() for column in ohlcv_columns)):
+            self.update(time, *row)
+
+    def on_message(self, message) -> bool:
+        """
+        Handle a kline stream message, True if it closed a candle of this pair
+        """
+        kline = message.get('k')
+        if message.get('e') != 'kline' or kline is None or not kline['x'] or kline['s'] != self.pair:
+            return False
+        self.update(kline['t'], *(float(kline[key]) for key in 'ohlcv'))
+        return True
+
+
+def follow(lives, feed):
+    """
+    Dispatch the kline messages of `feed` to the LiveData of their pair until the feed ends
+    """
+    by_pair = {live.pair: live for live in lives}
+    for message in feed:
+        live = by_pair.get(message.get('s'))
+        if live is not None:
+            live.on_message(message)
+
+
+def binance_kline_feed(pairs, timeframe):
+    """
+    Kline messages of all `pairs` from one binance websocket connection
+    """
+    from binance import ThreadedWebsocketManager
+
+    messages = queue.Queue()
+    manager = ThreadedWebsocketManager()
+    manager.start()
+    manager.start_multiplex_socket(callback=messages.put,
+                                   streams=[f'{pair.lower()}@kline_{timeframe}' for pair in pairs])
+    try:
+        while True:
+            message = messages.get()
+            # multiplexed messages wrap the kline message in 'data'
+            yield message.get('data', message)
+    finally:
+        manager.stop()
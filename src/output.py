@@ -0,0 +1,90 @@
+import sys
+
+import pandas as pd
+
+
+def print_table(frame, stream=None, head=None, tail=None, page=None, page_size=1000):
+    """
+    Print `frame` as psql style tables of at most `page_size` rows, each written as soon as it is formatted,
+    so memory use does not grow with the number of rows
+    :param stream: file-like object to write to, default -- stdout
+    :param head: only the first `head` rows
+    :param tail: only the last `tail` rows
+    :param page: only page number `page` (from 0) of `page_size` rows
+    """
+    from tabulate import tabulate
+
+    stream = sys.stdout if stream is None else stream
+    if head is not None:
+        frame = frame.iloc[:head]
+    if tail is not None:
+        frame = frame.iloc[len(frame) - min(tail, len(frame)):]
+    starts = range(0, len(frame), page_size)
+    if page is not None:
+        starts = starts[page:page + 1]
+    for start in starts:
+        print(tabulate(frame.iloc[start:start + page_size], headers='keys', tablefmt='psql'), file=stream)
+        stream.flush()
+
+
+def export_frame(frame, path, chunksize=100_000):
+    """
+    Write `frame` to `path`, as Parquet for a .parquet path (needs pyarrow or fastparquet) and CSV otherwise;
+    CSV is written `chunksize` rows at a time and compressed if the path ends in e.g. .gz
+    """
+    if str(path).endswith('.parquet'):
+        frame.to_parquet(path)
+    else:
+        frame.to_csv(path, chunksize=chunksize)
+
+
+class FrameWriter:
+    """
+    Write frames with the same columns to `path` one after another, in the format of `export_frame`:
+
+        with FrameWriter('btc.parquet') as writer:
+            for frame in frames:
+                writer.write(frame)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._parquet = None
+
+    def write(self, frame):
+        if str(self.path).endswith('.parquet'):
+            import pyarrow
+            import pyarrow.parquet
+
+            table = pyarrow.Table.from_pandas(frame)
+            if self._parquet is None:
+                self._parquet = pyarrow.parquet.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            first = self.rows == 0
+            frame.to_csv(self.path, mode='w' if first else 'a', header=first)
+        self.rows += len(frame)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_frame(path) -> pd.DataFrame:
+    """
+    Read a frame written by `export_frame`
+    """
+    if str(path).endswith('.parquet'):
+        return pd.read_parquet(path)
+    frame = pd.read_csv(path, index_col=0)
+    if 'time' in frame:
+        frame['time'] = pd.to_datetime(frame['time'])
+    return frame
@@ -0,0 +1,159 @@
+import numpy as np
+
+from kline_cache import _concat
+
+MINUTE = 60 * 1000
+DAY = 24 * 60 * MINUTE
+
+# length in ms of the binance kline intervals, None for months
+interval_ms = {'1m': MINUTE, '3m': 3 * MINUTE, '5m': 5 * MINUTE, '15m': 15 * MINUTE, '30m': 30 * MINUTE,
+               '1h': 60 * MINUTE, '2h': 120 * MINUTE, '4h': 240 * MINUTE, '6h': 360 * MINUTE, '8h': 480 * MINUTE,
+               '12h': 720 * MINUTE, '1d': DAY, '3d': 3 * DAY, '1w': 7 * DAY, '1M': None}
+
+# candles start at multiples of their length since the epoch, except weeks, which start on Monday
+# (the epoch was a Thursday), and months, which start on the 1st
+interval_offset = {'1w': 4 * DAY}
+
+
+def bucket_start(time, interval) -> np.ndarray:
+    """
+    Open time in ms of the `interval` candle each time in ms falls into
+    """
+    time = np.asarray(time, dtype=np.int64)
+    if interval == '1M':
+        return time.astype('datetime64[ms]').astype('datetime64[M]').astype('datetime64[ms]').astype(np.int64)
+    step, offset = interval_ms[interval], interval_offset.get(interval, 0)
+    return (time - offset) // step * step + offset
+
+
+def next_bucket_start(time, interval) -> int:
+    """
+    Open time in ms of the `interval` candle after the one `time` falls into
+    """
+    first = int(bucket_start(time, interval))
+    # a month is at most 31 days long
+    return first + interval_ms[interval] if interval != '1M' else int(bucket_start(first + 32 * DAY, interval))
+
+
+def nests(interval, base) -> bool:
+    """
+    Whether every candle of `interval` is made of whole candles of `base`
+    """
+    step = interval_ms[interval]
+    base_step = interval_ms[base]
+    if step is None:
+        return base_step is not None and DAY % base_step == 0
+    return base_step is not None and step % base_step == 0 and interval_offset.get(interval, 0) % base_step == 0 \
+        and interval_offset.get(base, 0) == 0
+
+
+def resample(data, interval) -> dict:
+    """
+    Candles of `interval` made of the time-sorted candles of a column dict like KlineCache.read gives:
+    first open, highest high, lowest low, last close and total volume of the candles opened in each.
+    A last candle that is not complete yet is returned like binance returns the current one.
+    """
+    time = np.asarray(data['time'], dtype=np.int64)
+    if time.size == 0:
+        return {column: np.asarray(values)[:0] for column, values in data.items()}
+    buckets = bucket_start(time, interval)
+    starts = np.flatnonzero(np.append(True, buckets[1:] != buckets[:-1]))
+    ends = np.append(starts[1:], time.size) - 1
+    return {'time': buckets[starts],
+            'open': np.asarray(data['open'], dtype=float)[starts],
+            'high': np.fmax.reduceat(np.asarray(data['high'], dtype=float), starts),
+            'low': np.fmin.reduceat(np.asarray(data['low'], dtype=float), starts),
+            'close': np.asarray(data['close'], dtype=float)[ends],
+            'volume': np.add.reduceat(np.nan_to_num(np.asarray(data['volume'], dtype=float)), starts)}
+
+
+class _Candles:
+    """
+    Column dict of time-sorted candles in arrays with room to grow, so candles are replaced from some time on
+    and appended without copying the ones before
+    """
+
+    def __init__(self):
+        self.arrays = {}
+        self.size = 0
+
+    def view(self) -> dict:
+        return {column: values[:self.size] for column, values in self.arrays.items()}
+
+    def index(self, time) -> int:
+        # position of the first candle opened at `time` or later
+        return int(np.searchsorted(self.arrays['time'][:self.size], time)) if self.size else 0
+
+    def replace_from(self, position, data):
+        """
+        Drop the candles from `position` on and append those of `data`
+        """
+        size = position + len(data['time'])
+        if not self.arrays or size > len(self.arrays['time']):
+            capacity = max(size, 2 * len(self.arrays['time'])) if self.arrays else size
+            grown = {column: np.empty(capacity, dtype=np.asarray(values).dtype) for column, values in data.items()}
+            for column, values in self.arrays.items():
+                grown[column][:position] = values[:position]
+            self.arrays = grown
+        for column, values in data.items():
+            self.arrays[column][position:size] = values
+        self.size = size
+
+
+class ResamplePyramid:
+    """
+    Candles of every interval in `intervals` built from candles of `base`, each interval from the longest one
+    it is made of (1m -> 5m -> 15m -> ... -> 1d -> 1w), so building the pyramid reads the base candles once.
+    New base candles passed to `update` only rebuild the candles they fall into, on every level,
+    in time proportional to their number and not to the history stored.
+    """
+
+    def __init__(self, base='1m', intervals=None):
+        intervals = [interval for interval in (intervals or interval_ms) if interval != base]
+        self.base = base
+        self.levels = {base: _Candles()}
+        # the interval each one is built from
+        self.parents = {}
+        for interval in sorted(intervals, key=_length):
+            if not nests(interval, base):
+                raise ValueError(f'{interval} candles are not made of whole {base} candles')
+            self.parents[interval] = max((level for level in self.levels if nests(interval, level)), key=_length)
+            self.levels[interval] = _Candles()
+
+    def __getitem__(self, interval) -> dict:
+        """
+        Candles of `interval` so far, None before the first update.
+        The arrays are views that later updates may overwrite.
+        """
+        level = self.levels[interval]
+        return level.view() if level.size else None
+
+    def update(self, data):
+        """
+        Add base candles (a column dict), replacing stored ones with the same open time,
+        e.g. the last candle downloaded again once it has closed
+        """
+        if len(data['time']) == 0:
+            return
+        first = int(np.min(data['time']))
+        stored = self.levels[self.base]
+        position = stored.index(first)
+        # only the stored candles from the first new one on are merged with them, usually just the one sent again
+        tail = {column: values[position:] for column, values in stored.view().items()}
+        stored.replace_from(position, _concat([tail, data] if stored.size else [data]))
+        changed = {self.base: first}
+        for interval, parent in self.parents.items():
+            # candles from the one the first changed parent candle falls into are built again
+            first = int(bucket_start(changed[parent], interval))
+            parent_level = self.levels[parent]
+            start = parent_level.index(first)
+            level = self.levels[interval]
+            level.replace_from(level.index(first), resample({column: values[start:]
+                                                             for column, values in parent_level.view().items()},
+                                                            interval))
+            changed[interval] = first
+
+
+def _length(interval) -> int:
+    # months sort after every fixed interval
+    return interval_ms[interval] or 31 * DAY
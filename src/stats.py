@@ -0,0 +1,120 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_active_stats = ContextVar('stats', default=None)
+
+
+class Stats:
+    """
+    Wall time, rows processed and, with `memory`, peak bytes allocated of every stage run while it is active:
+    downloads, kline conversion, cache reads and writes, `Data` indicators and charts, and each `ta` call.
+
+        with Stats(memory=True) as stats:
+            data = Data('DOGEUSDT', '1h', '1 Jan, 2023', indicators=[['sma', 20]])
+        stats.to_dict()
+
+    A stats object passed to `Data` is also active during each of its methods.
+    `callbacks` are called with every record as soon as its stage ends.
+    Memory is measured with tracemalloc, which slows allocations down noticeably.
+    """
+
+    def __init__(self, memory=False, callbacks=()):
+        self.memory = memory
+        self.callbacks = list(callbacks)
+        self.records = []
+        self._tokens = []
+        # [traced memory at the start, highest traced memory so far] of the stages in progress
+        self._open = []
+        # names of the stages in progress, for the `parent` of new records
+        self._names = []
+        self._tracing = False
+
+    def __enter__(self):
+        if self.memory and not self._tokens and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        self._tokens.append(_active_stats.set(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_stats.reset(self._tokens.pop())
+        if self._tracing and not self._tokens:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def clear(self):
+        self.records.clear()
+
+    def _peak(self, peak):
+        # tracemalloc has one peak, which every stage resets, so enclosing stages keep their own
+        if self._open:
+            self._open[-1][1] = max(self._open[-1][1], peak)
+        tracemalloc.reset_peak()
+
+    def _measure(self, name, fields):
+        record = {'stage': name, 'parent': self._names[-1] if self._names else None, 'rows': None, **fields}
+        memory = self.memory and tracemalloc.is_tracing()
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self._peak(peak)
+            self._open.append([current, current])
+        self._names.append(name)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self._names.pop()
+            if memory:
+                start_memory, peak = self._open.pop()
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                record['peak_bytes'] = peak - start_memory
+                self._peak(peak)
+            self.records.append(record)
+            for callback in self.callbacks:
+                callback(record)
+
+    def to_dict(self) -> dict:
+        """
+        Totals by stage name: calls, seconds, rows and the largest peak_bytes
+        """
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record['stage'], {'calls': 0, 'seconds': 0.0, 'rows': 0})
+            total['calls'] += 1
+            total['seconds'] += record['seconds']
+            total['rows'] += record['rows'] or 0
+            if 'peak_bytes' in record:
+                total['peak_bytes'] = max(total.get('peak_bytes', 0), record['peak_bytes'])
+        return totals
+
+    def write_json_lines(self, stream):
+        """
+        Write every record to `stream` as one line of JSON
+        """
+        for record in self.records:
+            stream.write(json.dumps(record) + '\n')
+
+
+def active_stats():
+    """
+    The Stats object recording at the moment, None if there is none
+    """
+    return _active_stats.get()
+
+
+@contextmanager
+def stage(name, stats=None, **fields):
+    """
+    Record the code run under it as stage `name` in `stats`, by default the active Stats object, if any.
+    Yields the record, a dict, so the stage can fill in `rows` and other fields once they are known.
+    """
+    stats = _active_stats.get() if stats is None else stats
+    if stats is None:
+        yield {}
+        return
+    with stats:
+        yield from stats._measure(name, fields)
@@ -0,0 +1,573 @@
+import math
+from collections import deque
+from heapq import heappush, heappop
+
+nan = math.nan
+
+
+def _div(a, b) -> float:
+    """
+    IEEE division as done by pandas: x / 0 gives +-inf, 0 / 0 and nan give nan
+    """
+    if b == 0:
+        if a == 0 or a != a:
+            return nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+class _EWM:
+    """
+    Exponentially weighted mean with the same recursion as pandas ``ewm(...).mean()``
+    """
+
+    def __init__(self, com, adjust=True):
+        alpha = 1.0 / (1.0 + com)
+        self.factor = 1.0 - alpha
+        self.new_wt = 1.0 if adjust else alpha
+        self.adjust = adjust
+        self.weighted = nan
+        self.old_wt = 1.0
+        self.nobs = 0
+
+    def update(self, value) -> float:
+        is_observation = value == value
+        self.nobs += is_observation
+        weighted = self.weighted
+        if weighted == weighted:
+            self.old_wt *= self.factor
+            if is_observation:
+                if weighted != value:
+                    weighted = self.old_wt * weighted + self.new_wt * value
+                    weighted /= (self.old_wt + self.new_wt)
+                    self.weighted = weighted
+                if self.adjust:
+                    self.old_wt += self.new_wt
+                else:
+                    self.old_wt = 1.0
+        elif is_observation:
+            self.weighted = value
+        return self.weighted if self.nobs else nan
+
+
+def _span_com(span):
+    return (span - 1) / 2.0
+
+
+def _alpha_com(alpha):
+    return 1.0 / alpha - 1.0
+
+
+class _SpanEWMChain:
+    """
+    EMA of the values, the EMA of that and so on, `levels` of them, as kernels._span_ewm_chain
+    """
+
+    def __init__(self, span, adjust, levels):
+        self._levels = [_EWM(_span_com(span), adjust) for _ in range(levels)]
+
+    def update(self, value) -> list:
+        chain = []
+        for level in self._levels:
+            value = level.update(value)
+            chain.append(value)
+        return chain
+
+
+def _suffix_sums(block) -> list:
+    """
+    Sums of `block` from every position but the last + 1 to its end, added up from the end
+    like kernels._suffix_sums does
+    """
+    sums = [0.0] * (len(block) - 1)
+    total = nan
+    for j in range(len(block) - 2, -1, -1):
+        total = block[j + 1] if j == len(block) - 2 else total + block[j + 1]
+        sums[j] = total
+    return sums
+
+
+class _RollingSum:
+    """
+    Rolling sum over the blocks of `period` values kernels._rolling_sum adds up, so the two agree bit for bit:
+    the sum of a window is that of the newest block up to it, kept running, plus the end of the block before,
+    whose sums are taken once it is complete. Missing values count as 0 and leave any window holding them missing.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.block = []
+        self.prefix = 0.0
+        self.suffix = []
+        self.count = 0
+        self.last_missing = -period
+
+    def update(self, value) -> float:
+        position = self.count
+        self.count += 1
+        if value != value:
+            self.last_missing = position
+            value = 0.0
+        offset = position % self.period
+        if offset == 0:
+            if position:
+                self.suffix = _suffix_sums(self.block)
+            self.block = []
+            self.prefix = value
+        else:
+            self.prefix += value
+        self.block.append(value)
+
+        if self.count < self.period or position - self.last_missing < self.period:
+            return nan
+        return self.prefix + self.suffix[offset] if offset < self.period - 1 else self.prefix
+
+
+class _RollingMean(_RollingSum):
+    """
+    Rolling mean of kernels._rolling_mean
+    """
+
+    def update(self, value) -> float:
+        return super().update(value) / self.period
+
+
+class _RollingStd:
+    """
+    Rolling sample standard deviation of kernels._rolling_std, bit for bit: sums of deviations from the first
+    value of the newest block, over the same blocks as _RollingSum
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.block = []
+        self.shift = 0.0
+        self.sum_x = 0.0
+        self.sum_xx = 0.0
+        self.suffix_x = []
+        self.suffix_xx = []
+        self.count = 0
+        self.last_missing = -period
+
+    def update(self, value) -> float:
+        position = self.count
+        self.count += 1
+        if value != value:
+            self.last_missing = position
+            value = 0.0
+        period = self.period
+        offset = position % period
+        if offset == 0:
+            if position:
+                # the block before, as deviations from the first value of this one
+                previous = [x - value for x in self.block]
+                self.suffix_x = _suffix_sums(previous)
+                self.suffix_xx = _suffix_sums([x * x for x in previous])
+            self.block = []
+            self.shift = value
+        self.block.append(value)
+        deviation = value - self.shift
+        if offset == 0:
+            self.sum_x = deviation
+            self.sum_xx = deviation * deviation
+        else:
+            self.sum_x += deviation
+            self.sum_xx += deviation * deviation
+
+        if period < 2 or self.count < period or position - self.last_missing < period:
+            return nan
+        sum_x, sum_xx = self.sum_x, self.sum_xx
+        if offset < period - 1:
+            sum_x += self.suffix_x[offset]
+            sum_xx += self.suffix_xx[offset]
+        variance = (sum_xx - sum_x * sum_x / period) / (period - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+class _RollingExtreme:
+    """
+    Rolling max (or min) over a monotonic deque, amortised O(1) per value
+    """
+
+    def __init__(self, period, maximum=True):
+        self.period = period
+        self.maximum = maximum
+        self.candidates = deque()
+        self.nan_positions = deque()
+        self.count = 0
+
+    def update(self, value) -> float:
+        position = self.count
+        self.count += 1
+        oldest = position - self.period
+        candidates = self.candidates
+        while candidates and candidates[0][0] <= oldest:
+            candidates.popleft()
+        while self.nan_positions and self.nan_positions[0] <= oldest:
+            self.nan_positions.popleft()
+
+        if value != value:
+            self.nan_positions.append(position)
+        elif self.maximum:
+            while candidates and candidates[-1][1] <= value:
+                candidates.pop()
+            candidates.append((position, value))
+        else:
+            while candidates and candidates[-1][1] >= value:
+                candidates.pop()
+            candidates.append((position, value))
+
+        if self.count < self.period or self.nan_positions:
+            return nan
+        return candidates[0][1]
+
+
+class _RollingMedian:
+    """
+    Rolling median over two heaps, the lower half of the window as a max-heap and the upper half as a min-heap.
+    Values leaving the window are only counted, and dropped once they reach the top of their heap,
+    so each value costs O(log period).
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.window = deque()
+        # the lower half negated, as heapq only has min-heaps
+        self.lower = []
+        self.upper = []
+        # values in each half, not counting those waiting to be dropped
+        self.lower_size = 0
+        self.upper_size = 0
+        # value: how many of it left the window but are still in a heap
+        self.dropped = {}
+        self.nans = 0
+
+    def _prune(self, heap, sign):
+        while heap and self.dropped.get(sign * heap[0]):
+            value = sign * heappop(heap)
+            self.dropped[value] -= 1
+            if not self.dropped[value]:
+                del self.dropped[value]
+
+    def _balance(self):
+        # the lower half has as many values as the upper one, or one more
+        if self.lower_size > self.upper_size + 1:
+            heappush(self.upper, -heappop(self.lower))
+            self.lower_size -= 1
+            self.upper_size += 1
+            self._prune(self.lower, -1)
+        elif self.lower_size < self.upper_size:
+            heappush(self.lower, -heappop(self.upper))
+            self.upper_size -= 1
+            self.lower_size += 1
+            self._prune(self.upper, 1)
+
+    def _insert(self, value):
+        if not self.lower or value <= -self.lower[0]:
+            heappush(self.lower, -value)
+            self.lower_size += 1
+        else:
+            heappush(self.upper, value)
+            self.upper_size += 1
+        self._balance()
+
+    def _remove(self, value):
+        self.dropped[value] = self.dropped.get(value, 0) + 1
+        if value <= -self.lower[0]:
+            self.lower_size -= 1
+            if value == -self.lower[0]:
+                self._prune(self.lower, -1)
+        else:
+            self.upper_size -= 1
+            if value == self.upper[0]:
+                self._prune(self.upper, 1)
+        self._balance()
+
+    def update(self, value) -> float:
+        self.window.append(value)
+        if value != value:
+            self.nans += 1
+        else:
+            self._insert(value)
+        if len(self.window) > self.period:
+            oldest = self.window.popleft()
+            if oldest != oldest:
+                self.nans -= 1
+            else:
+                self._remove(oldest)
+
+        if len(self.window) < self.period or self.nans:
+            return nan
+        if self.lower_size > self.upper_size:
+            return -self.lower[0]
+        return (-self.lower[0] + self.upper[0]) / 2
+
+
+class StreamingSMA:
+    """
+    Simple moving average, one candle at a time
+    """
+
+    def __init__(self, period=10):
+        self.period = period
+        self._mean = _RollingMean(period)
+        self.value = nan
+
+    def update(self, close) -> float:
+        self.value = self._mean.update(close)
+        return self.value
+
+
+class StreamingSMM:
+    """
+    Simple moving median, one candle at a time
+    """
+
+    def __init__(self, period=10):
+        self.period = period
+        self._median = _RollingMedian(period)
+        self.value = nan
+
+    def update(self, close) -> float:
+        self.value = self._median.update(close)
+        return self.value
+
+
+class StreamingEMA:
+    """
+    Exponential Moving Average, one candle at a time
+    """
+
+    def __init__(self, period=10, adjust=True):
+        self.period = period
+        self._ewm = _EWM(_span_com(period), adjust)
+        self.value = nan
+
+    def update(self, close) -> float:
+        self.value = self._ewm.update(close)
+        return self.value
+
+
+class StreamingSSMA:
+    """
+    Smoothed simple moving average, one candle at a time
+    """
+
+    def __init__(self, period=10, adjust=True):
+        self.period = period
+        self._ewm = _EWM(_alpha_com(1.0 / period), adjust)
+        self.value = nan
+
+    def update(self, close) -> float:
+        self.value = self._ewm.update(close)
+        return self.value
+
+
+class StreamingSMMA(StreamingSSMA):
+    """
+    Smoothed Moving Average, one candle at a time
+    """
+
+
+class StreamingDEMA:
+    """
+    Double Exponential Moving Average, one candle at a time
+    """
+
+    def __init__(self, period=10, adjust=True):
+        self.period = period
+        self._chain = _SpanEWMChain(period, adjust, 2)
+        self.value = nan
+
+    def update(self, close) -> float:
+        ema_1, ema_2 = self._chain.update(close)
+        self.value = 2 * ema_1 - ema_2
+        return self.value
+
+
+class StreamingTEMA:
+    """
+    Triple exponential moving average, one candle at a time
+    """
+
+    def __init__(self, period=10, adjust=True):
+        self.period = period
+        self._chain = _SpanEWMChain(period, adjust, 3)
+        self.value = nan
+
+    def update(self, close) -> float:
+        ema_1, ema_2, ema_3 = self._chain.update(close)
+        self.value = 3 * ema_1 - 3 * ema_2 + ema_3
+        return self.value
+
+
+class StreamingTRIX:
+    """
+    TRIX, the rate of change of a triple exponential moving average in percent, one candle at a time
+    """
+
+    def __init__(self, period=10, adjust=True):
+        self.period = period
+        self._chain = _SpanEWMChain(period, adjust, 3)
+        self._prev = nan
+        self.value = nan
+
+    def update(self, close) -> float:
+        m = self._chain.update(close)[-1]
+        self.value = 100 * _div(m - self._prev, m)
+        self._prev = m
+        return self.value
+
+
+class StreamingRSI:
+    """
+    Relative Strength Index, one candle at a time
+    """
+
+    def __init__(self, period=10, adjust=True):
+        self.period = period
+        self._gain = _EWM(_alpha_com(1.0 / period), adjust)
+        self._loss = _EWM(_alpha_com(1.0 / period), adjust)
+        self._prev_close = nan
+        self.value = nan
+
+    def update(self, close) -> float:
+        delta = close - self._prev_close
+        self._prev_close = close
+        if delta != delta:
+            up = down = nan
+        else:
+            up = delta if delta > 0 else 0.0
+            down = -delta if delta < 0 else 0.0
+        gain = self._gain.update(up)
+        loss = self._loss.update(down)
+        self.value = 100 - _div(100, 1 + _div(gain, loss))
+        return self.value
+
+
+class StreamingTR:
+    """
+    True Range, one candle at a time
+    """
+
+    def __init__(self):
+        self._prev_close = nan
+        self.value = nan
+
+    def update(self, high, low, close) -> float:
+        prev_close = self._prev_close
+        self._prev_close = close
+        ranges = [r for r in (abs(high - low), abs(high - prev_close), abs(prev_close - low)) if r == r]
+        self.value = max(ranges) if ranges else nan
+        return self.value
+
+
+class StreamingATR:
+    """
+    Average True Range, one candle at a time
+    """
+
+    def __init__(self, period=10):
+        self.period = period
+        self._tr = StreamingTR()
+        self._mean = _RollingMean(period)
+        self.value = nan
+
+    def update(self, high, low, close) -> float:
+        self.value = self._mean.update(self._tr.update(high, low, close))
+        return self.value
+
+
+class StreamingMACD:
+    """
+    MACD, MACD Signal and MACD difference, one candle at a time
+    """
+
+    def __init__(self, period_fast=12, period_slow=26, signal=9, adjust=True):
+        self.period_fast = period_fast
+        self.period_slow = period_slow
+        self.signal = signal
+        self._fast = _EWM(_span_com(period_fast), adjust)
+        self._slow = _EWM(_span_com(period_slow), adjust)
+        self._signal = _EWM(_span_com(signal), adjust)
+        self.value = (nan, nan, nan)
+
+    def update(self, close) -> (float, float, float):
+        macd = self._fast.update(close) - self._slow.update(close)
+        macd_signal = self._signal.update(macd)
+        self.value = (macd, macd_signal, macd - macd_signal)
+        return self.value
+
+
+class StreamingBBANDS:
+    """
+    Bollinger Bands (upper, middle, lower), one candle at a time
+    """
+
+    def __init__(self, period=14, std_multiplier=2):
+        self.period = period
+        self.std_multiplier = std_multiplier
+        self._mean = _RollingMean(period)
+        self._std = _RollingStd(period)
+        self.value = (nan, nan, nan)
+
+    def update(self, close) -> (float, float, float):
+        middle = self._mean.update(close)
+        width = self.std_multiplier * self._std.update(close)
+        self.value = (middle + width, middle, middle - width)
+        return self.value
+
+
+class StreamingKC:
+    """
+    Keltner Channels (upper, lower) around the EMA of the close, one candle at a time
+    """
+
+    def __init__(self, period=20, atr_period=10, kc_mult=2):
+        self.period = period
+        self.kc_mult = kc_mult
+        self._middle = _EWM(_span_com(period))
+        self._atr = StreamingATR(atr_period)
+        self.value = (nan, nan)
+
+    def update(self, high, low, close) -> (float, float):
+        middle = self._middle.update(close)
+        width = self.kc_mult * self._atr.update(high, low, close)
+        self.value = (middle + width, middle - width)
+        return self.value
+
+
+class StreamingSTOCH:
+    """
+    Stochastic oscillator %K, one candle at a time
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self._highest = _RollingExtreme(period, maximum=True)
+        self._lowest = _RollingExtreme(period, maximum=False)
+        self.value = nan
+
+    def update(self, high, low, close) -> float:
+        highest_high = self._highest.update(high)
+        lowest_low = self._lowest.update(low)
+        self.value = _div(close - lowest_low, highest_high - lowest_low) * 100
+        return self.value
+
+
+class StreamingWILLIAMS:
+    """
+    Williams %R, one candle at a time
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self._highest = _RollingExtreme(period, maximum=True)
+        self._lowest = _RollingExtreme(period, maximum=False)
+        self.value = nan
+
+    def update(self, high, low, close) -> float:
+        highest_high = self._highest.update(high)
+        lowest_low = self._lowest.update(low)
+        self.value = _div(highest_high - close, highest_high - lowest_low) * -100
+        return self.value
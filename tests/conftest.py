@@ -0,0 +1,46 @@
+import os
+import sys
+
+import binance.client
+import numpy as np
+import pytest
+from binance.helpers import convert_ts_str, date_to_milliseconds
+
+# modules in src/ are scripts importing each other by bare name, the way `python3 src/main.py` sees them;
+# tests import them the same way so that each is loaded once
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+HOUR = 3600 * 1000
+LISTING = date_to_milliseconds('1 Jan, 2022')
+prices = 0.17 + np.cumsum(np.random.default_rng(3).normal(scale=1e-3, size=2000))
+
+
+class FakeClient:
+    """
+    Hourly klines from LISTING until `now`
+    """
+    now = date_to_milliseconds('10 Jan, 2022')
+
+    def __init__(self, *args):
+        self.requests = []
+
+    def get_historical_klines(self, symbol, interval, start_str, end_str):
+        start, end = convert_ts_str(start_str), min(convert_ts_str(end_str), self.now)
+        self.requests.append((start, end))
+        first = max(LISTING, -(-start // HOUR) * HOUR)
+        klines = []
+        for t in range(first, end + 1, HOUR):
+            price = prices[(t - LISTING) // HOUR]
+            klines.append([t, str(price), str(price * 1.01), str(price * 0.99), str(price), '100.0', t + HOUR - 1,
+                           '0', 0, '0', '0', '0'])
+        return klines
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """
+    binance.client.Client replaced by FakeClient, the class itself
+    """
+    monkeypatch.setattr(binance.client, 'Client', FakeClient)
+    monkeypatch.setattr(FakeClient, 'now', date_to_milliseconds('10 Jan, 2022'))
+    return FakeClient
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import ta, _values
+
+pyarrow = pytest.importorskip('pyarrow')
+
+ohlcv = pd.read_csv('tests/data/binance_doge-usdt.csv')
+cols = ['open', 'high', 'low', 'close', 'volume']
+ohlcv[cols] = ohlcv[cols].apply(pd.to_numeric, errors='coerce', axis=1)
+table = pyarrow.Table.from_pandas(ohlcv[cols], preserve_index=False)
+
+cases = [('SMA', 14), ('SMM', 14), ('SSMA', 14), ('EMA', 14), ('DEMA', 14), ('TEMA', 14), ('TRIMA', 14),
+         ('TRIX', 14), ('VAMA', 14), ('WMA', 14), ('SMMA', 14), ('MOM', 14), ('ROC', 14), ('RSI', 14), ('ATR', 14),
+         ('STOCH', 14), ('WILLIAMS', 14), ('TR',), ('MACD',), ('BBANDS', 20), ('KC', 20)]
+
+
+def as_list(result):
+    return result if isinstance(result, list) else [result]
+
+
+def test_arrow_matches_pandas():
+    for data in (table, table.to_batches(max_chunksize=len(table))[0]):
+        for name, *args in cases:
+            for result, expected in zip(as_list(getattr(ta, name)(data, *args)),
+                                        as_list(getattr(ta, name)(ohlcv, *args))):
+                assert type(result) is type(data)
+                assert result.column_names == [expected.name]
+                np.testing.assert_array_equal(result.column(0).to_numpy(), expected.values)
+
+
+def test_arrow_sweeps_and_moving_average_argument():
+    result = ta.EMA_sweep(table, [5, 20])
+    expected = ta.EMA_sweep(ohlcv, [5, 20])
+    assert result.column_names == ['5', '20']
+    np.testing.assert_array_equal(result.column('20').to_numpy(), expected[20].values)
+    upper = ta.BBANDS(table, 20, MA=ta.EMA(table, 20))[0]
+    np.testing.assert_array_equal(upper.column(0).to_numpy(), ta.BBANDS(ohlcv, 20, MA=ta.EMA(ohlcv, 20))[0].values)
+
+
+def test_arrow_columns_are_not_copied():
+    close = table.column('close').chunk(0)
+    assert _values(table, 'close').ctypes.data == close.buffers()[1].address
+    # several chunks or nulls need a copy, the values are the same
+    chunked = pyarrow.concat_tables([table.slice(0, 100), table.slice(100)])
+    np.testing.assert_array_equal(_values(chunked, 'close'), close.to_numpy())
+    with_nulls = pyarrow.table({'close': pyarrow.array([1.0, None, 3.0])})
+    np.testing.assert_array_equal(_values(with_nulls, 'close'), [1.0, np.nan, 3.0])
+
+
+def test_polars_matches_pandas():
+    polars = pytest.importorskip('polars')
+    frame = polars.from_pandas(ohlcv[cols])
+    for name, *args in cases:
+        for result, expected in zip(as_list(getattr(ta, name)(frame, *args)), as_list(getattr(ta, name)(ohlcv, *args))):
+            assert isinstance(result, polars.DataFrame)
+            assert result.columns == [expected.name]
+            np.testing.assert_array_equal(result.to_series().to_numpy(), expected.values)
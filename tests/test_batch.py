@@ -0,0 +1,44 @@
+import io
+import json
+import multiprocessing
+
+import pytest
+
+import batch
+from output import read_frame
+
+
+def write_spec(tmp_path, **changes):
+    spec = {'pairs': ['DOGEUSDT', 'BTCUSDT'], 'timeframes': ['1h', '4h'], 'start_date': '5 Jan, 2022',
+            'indicators': {'trend': [['sma', 20], ['ema', 14]], 'momentum': [['rsi', 14], ['macd', 12, 26]]},
+            'output_dir': str(tmp_path / 'results'), 'cache_dir': None}
+    spec.update(changes)
+    path = tmp_path / 'jobs.json'
+    path.write_text(json.dumps(spec))
+    return path
+
+
+def test_batch_writes_every_indicator_set(fake_client, tmp_path):
+    spec = batch.load_spec(write_spec(tmp_path, timeframes=['1h', '3x'], base_timeframe='1h'))
+    stream = io.StringIO()
+    results = batch.run_batch(batch.make_jobs(spec), workers=1, stream=stream)
+
+    assert len(results) == 4
+    failed = [result for result in results if result['error'] is not None]
+    assert [result['timeframe'] for result in failed] == ['3x', '3x']
+    assert 'FAILED' in stream.getvalue() and '2 jobs done, 2 failed' in stream.getvalue()
+    frame = read_frame(tmp_path / 'results' / 'DOGEUSDT_1h_momentum.csv')
+    assert list(frame.columns) == ['time', 'open', 'high', 'low', 'close', 'volume', 'rsi_14', 'macd_12_26',
+                                   'macd_signal_12_26', 'macd_difference_12_26']
+    assert not frame.isna().any().any()
+    assert 'ta.SMA' in results[0]['stages']
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='workers inherit the fake client by fork')
+def test_batch_in_processes(fake_client, tmp_path):
+    report = tmp_path / 'report.jsonl'
+    assert batch.main([str(write_spec(tmp_path)), '--workers', '2', '--report', str(report)]) == 0
+    results = [json.loads(line) for line in report.read_text().splitlines()]
+    assert sorted((result['pair'], result['timeframe']) for result in results) == \
+           [('BTCUSDT', '1h'), ('BTCUSDT', '4h'), ('DOGEUSDT', '1h'), ('DOGEUSDT', '4h')]
+    assert len(list((tmp_path / 'results').iterdir())) == 8
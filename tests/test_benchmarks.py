@@ -0,0 +1,28 @@
+import copy
+
+from benchmarks import bench_indicators
+
+
+def test_benchmark_runs_every_indicator():
+    results = bench_indicators.run(sizes=[500], periods=[5, 20], repeat=1)
+    assert {result['indicator'] for result in results} == set(bench_indicators.cases)
+    assert len(results) == 2 * len(bench_indicators.cases) - len(bench_indicators.no_period)
+    for result in results:
+        assert result['seconds'] > 0 and result['finta_seconds'] > 0
+        assert result['peak_mb'] > 0
+    assert bench_indicators.run(sizes=[500], periods=[5], indicators=['SMA'], repeat=1,
+                                finta_max_size=100)[0]['finta_seconds'] is None
+
+
+def test_check_flags_regressions():
+    results = [{'indicator': 'SMA', 'size': 10 ** 6, 'period': 10, 'seconds': 0.01, 'peak_mb': 16.0},
+               {'indicator': 'TR', 'size': 10 ** 6, 'period': None, 'seconds': 0.02, 'peak_mb': 30.0}]
+    baseline = {'calibration': 0.1, 'results': {bench_indicators.key(result): result for result in results}}
+    assert bench_indicators.check(results, baseline) == []
+
+    slower = copy.deepcopy(results)
+    slower[0]['seconds'] = 0.02
+    slower[1]['peak_mb'] = 60.0
+    assert len(bench_indicators.check(slower, baseline)) == 2
+    # a machine twice as slow on the calibration workload is allowed twice the time
+    assert bench_indicators.check(slower[:1], baseline, calibration=0.2) == []
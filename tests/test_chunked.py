@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chunked import compute_chunked
+from indicators import compute_indicator
+from output import read_frame
+
+source = 'tests/data/binance_doge-usdt.csv'
+indicators = [['volume'], ['sma', 20], ['smm', 9], ['ssma', 10], ['ema', 14], ['dema', 10], ['tema', 8],
+              ['trima', 10], ['trix', 5], ['vama', 10], ['wma', 9], ['smma', 12], ['macd', 12, 26], ['mom', 10],
+              ['roc', 10], ['rsi', 14], ['tr'], ['atr', 14], ['bbands', 20], ['kc', 20], ['stoch', 14],
+              ['williams', 14]]
+
+
+@pytest.mark.parametrize('chunksize', [5, 64, 10_000])
+def test_chunked_matches_whole_table(tmp_path, chunksize):
+    ohlcv = pd.read_csv(source)
+    output = tmp_path / 'doge.csv.gz'
+    assert compute_chunked(source, output, indicators, chunksize=chunksize) == len(ohlcv)
+
+    result = read_frame(output)
+    pd.testing.assert_frame_equal(result[ohlcv.columns[1:]], ohlcv[ohlcv.columns[1:]])
+    for info in indicators:
+        for column, expected in compute_indicator(info, ohlcv).items():
+            scale = np.nanmax(np.abs(expected.to_numpy()))
+            np.testing.assert_allclose(result[column], expected, rtol=1e-12, atol=1e-12 * scale, err_msg=column)
+
+
+def test_parquet_output(tmp_path):
+    pytest.importorskip('pyarrow')
+    compute_chunked(source, tmp_path / 'doge.parquet', [['ema', 14]], chunksize=100)
+    compute_chunked(tmp_path / 'doge.parquet', tmp_path / 'again.csv', [['sma', 5]], chunksize=33)
+    result = read_frame(tmp_path / 'again.csv')
+    np.testing.assert_allclose(result['ema_14'], read_frame(tmp_path / 'doge.parquet')['ema_14'])
+    assert list(result.index) == list(range(len(result)))
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+import indicators
+from indicators import ta
+from kernels import IndicatorContext
+
+ohlcv = pd.read_csv('tests/data/binance_doge-usdt.csv')
+cols = ['open', 'high', 'low', 'close', 'volume']
+ohlcv[cols] = ohlcv[cols].apply(pd.to_numeric, errors='coerce', axis=1)
+
+cases = [('SMA', 14), ('EMA', 14), ('DEMA', 14), ('TEMA', 14), ('TRIX', 14), ('TRIMA', 14), ('RSI', 14),
+         ('SMMA', 14), ('TR',), ('ATR', 10), ('KC', 14, 10), ('BBANDS', 14), ('STOCH', 14), ('WILLIAMS', 14),
+         ('MACD',)]
+
+
+def as_list(result):
+    return result if isinstance(result, list) else [result]
+
+
+def count_calls(monkeypatch, name):
+    calls = []
+    func = getattr(indicators.kernels, name)
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return func(*args, **kwargs)
+
+    monkeypatch.setattr(indicators.kernels, name, counted)
+    return calls
+
+
+def test_context_gives_same_results():
+    context = IndicatorContext()
+    for _ in range(2):
+        with context:
+            for name, *args in cases:
+                for shared, plain in zip(as_list(getattr(ta, name)(ohlcv, *args)),
+                                         as_list(getattr(ta, name)(ohlcv.copy(), *args))):
+                    np.testing.assert_array_equal(shared.values, plain.values)
+    assert context.hits > 0
+
+
+def test_ema_levels_are_shared(monkeypatch):
+    # without a context the JIT backend computes all levels of DEMA, TEMA and TRIX in one fused pass
+    monkeypatch.setattr(indicators.kernels, 'JIT', False)
+    ewms = count_calls(monkeypatch, '_ewm')
+    for name in ('EMA', 'DEMA', 'TEMA', 'TRIX'):
+        getattr(ta, name)(ohlcv, 14)
+    assert len(ewms) == 1 + 2 + 3 + 3
+
+    ewms.clear()
+    with IndicatorContext():
+        for name in ('EMA', 'DEMA', 'TEMA', 'TRIX'):
+            getattr(ta, name)(ohlcv, 14)
+    assert len(ewms) == 3
+
+
+def test_rolling_high_low_and_tr_are_shared(monkeypatch):
+    windows = count_calls(monkeypatch, '_rolling_extreme')
+    ranges = count_calls(monkeypatch, '_shift')
+    with IndicatorContext():
+        ta.STOCH(ohlcv, 14)
+        ta.WILLIAMS(ohlcv, 14)
+        ta.TR(ohlcv)
+        ta.ATR(ohlcv, 10)
+        ta.KC(ohlcv, 20, 10)
+    assert len(windows) == 2
+    assert len(ranges) == 1
+
+
+def test_context_is_only_active_inside_with():
+    context = IndicatorContext()
+    with context:
+        ta.EMA(ohlcv, 14)
+    ta.EMA(ohlcv, 14)
+    assert (context.hits, context.misses) == (0, 1)
+    context.clear()
+    with context:
+        ta.EMA(ohlcv, 14)
+    assert context.misses == 2
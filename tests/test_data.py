@@ -0,0 +1,104 @@
+import binance.client
+import numpy as np
+import pandas as pd
+import plotly.graph_objects
+import plotly.subplots
+
+import get_data
+
+HOUR = 3600 * 1000
+
+indicators = [['volume'], ['sma', 20], ['ema', 14], ['bbands', 20], ['macd', 12, 26], ['rsi', 14], ['KC', 20],
+              ['trix', 10], ['williams', 14]]
+
+
+def make_data(start_date='3 Jan, 2022', **kwargs):
+    return get_data.Data('DOGEUSDT', '1h', start_date, 'now', indicators, cache_dir=None, download_workers=1,
+                         **kwargs)
+
+
+def test_warmup_is_fetched_and_trimmed(fake_client):
+    data = make_data()
+    assert data.ohlcv['time'].iloc[0] == pd.Timestamp('3 Jan, 2022')
+    assert data.ohlcv.index[0] == 0 and data.warmup.index[-1] == -1
+    assert not data.ohlcv.isna().any().any()
+    # one trace per column, plus price and volume
+    assert len(data.fig.data) == 2 + 1 + 1 + 3 + 3 + 1 + 2 + 1 + 1
+
+
+def test_warmup_gives_the_values_of_the_whole_history(fake_client):
+    ewms = [['ema', 10], ['rsi', 5]]
+    late = get_data.Data('DOGEUSDT', '1h', '9 Jan, 2022', 'now', ewms, cache_dir=None, download_workers=1)
+    whole = get_data.Data('DOGEUSDT', '1h', '1 Jan, 2022', 'now', ewms, cache_dir=None, download_workers=1)
+    assert late.warmup['time'].iloc[0] > whole.ohlcv['time'].iloc[0]
+    expected = whole.ohlcv[whole.ohlcv['time'] >= late.ohlcv['time'].iloc[0]]
+    for column in late.ohlcv.columns[1:]:
+        scale = np.abs(expected[column]).max()
+        np.testing.assert_allclose(late.ohlcv[column], expected[column], rtol=0, atol=1e-12 * scale, err_msg=column)
+
+
+def test_refresh_appends_and_recomputes_tail(fake_client):
+    data = make_data()
+    figure = data.fig
+    fake_client.now += 5 * HOUR
+    assert data.refresh() == 5
+    assert data.fig is figure
+    fresh = make_data()
+
+    assert list(data.ohlcv.columns) == list(fresh.ohlcv.columns)
+    pd.testing.assert_series_equal(data.ohlcv['time'], fresh.ohlcv['time'])
+    for column in data.ohlcv.columns[1:]:
+        scale = np.abs(fresh.ohlcv[column]).max()
+        np.testing.assert_allclose(data.ohlcv[column], fresh.ohlcv[column], rtol=0, atol=1e-12 * scale,
+                                   err_msg=column)
+    for trace in data.fig.data:
+        assert len(trace.x) == len(fresh.ohlcv)
+    assert data.refresh() == 0
+
+
+def test_float32_data(fake_client):
+    data = make_data(dtype='float32')
+    fake_client.now += 5 * HOUR
+    assert data.refresh() == 5
+    fresh = make_data()
+    assert (data.ohlcv.dtypes.drop('time') == np.float32).all()
+    for column in data.ohlcv.columns[1:]:
+        scale = np.abs(fresh.ohlcv[column]).max()
+        np.testing.assert_allclose(data.ohlcv[column], fresh.ohlcv[column], rtol=0, atol=1e-5 * scale,
+                                   err_msg=column)
+
+
+def test_downloader_needs_no_client(fake_client, monkeypatch):
+    def no_client(*args):
+        raise AssertionError('client built')
+
+    monkeypatch.setattr(binance.client, 'Client', no_client)
+    monkeypatch.setattr(get_data, 'KlineDownloader', lambda max_workers: fake_client())
+    data = get_data.Data('DOGEUSDT', '1h', '3 Jan, 2022', 'now', [['sma', 20]], cache_dir=None, download_workers=8)
+    assert data.client is None
+    assert data.ohlcv['time'].iloc[0] == pd.Timestamp('3 Jan, 2022')
+
+
+def test_max_points_downsamples_traces(fake_client):
+    data = get_data.Data('DOGEUSDT', '1h', '3 Jan, 2022', 'now', indicators, cache_dir=None, download_workers=1,
+                         max_points=50)
+    assert len(data.ohlcv) > 50
+    for trace in data.fig.data:
+        assert len(trace.x) == 50
+        assert trace.type in ('candlestick', 'bar', 'scattergl')
+
+
+def test_headless_until_fig_is_used(fake_client, monkeypatch):
+    def no_plotting(*args, **kwargs):
+        raise AssertionError('chart built')
+
+    monkeypatch.setattr(plotly.subplots, 'make_subplots', no_plotting)
+    monkeypatch.setattr(plotly.graph_objects, 'Scatter', no_plotting)
+    data = make_data()
+    data.add_indicator(['atr', 14])
+    fake_client.now += HOUR
+    data.refresh()
+    assert not data.ohlcv['atr_14'].isna().any()
+
+    monkeypatch.undo()
+    assert len(data.fig.data) == 2 + 1 + 1 + 3 + 3 + 1 + 2 + 1 + 1 + 1
@@ -0,0 +1,118 @@
+import json
+import threading
+import urllib.error
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from binance.helpers import date_to_milliseconds
+
+from downloader import KlineDownloader, KLINES_PATH
+
+MINUTE = 60 * 1000
+LISTING = date_to_milliseconds('1 Jan, 2022')
+CANDLES = 5500
+
+
+class KlinesHandler(BaseHTTPRequestHandler):
+    """
+    Stand-in for the klines endpoint: CANDLES 1m candles from LISTING, a 429 for every 4th request.
+    The first requests fail as listed in `failures`: an HTTP status, or 'slow' for no response within a second.
+    """
+    requests = []
+    failures = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        query = {key: int(value[0]) if key != 'symbol' and key != 'interval' else value[0]
+                 for key, value in urllib.parse.parse_qs(url.query).items()}
+        with self.lock:
+            self.requests.append(query)
+            throttled = len(self.requests) % 4 == 0
+            failure = self.failures.pop(0) if self.failures else None
+        if failure == 'slow':
+            threading.Event().wait(1)
+            return
+        if failure is not None:
+            self.send_error(failure)
+            return
+        if url.path != KLINES_PATH:
+            self.send_error(404)
+            return
+        if throttled:
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+
+        first = max(LISTING, -(-query['startTime'] // MINUTE) * MINUTE)
+        last = min(LISTING + (CANDLES - 1) * MINUTE, query.get('endTime', LISTING + CANDLES * MINUTE))
+        times = list(range(first, last + 1, MINUTE))[:query['limit']]
+        body = json.dumps([[t, '1.0', '2.0', '0.5', str(t), '10.0', t + MINUTE - 1, '0', 0, '0', '0', '0']
+                           for t in times]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('X-MBX-USED-WEIGHT-1M', str(len(self.requests)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    KlinesHandler.requests = []
+    KlinesHandler.failures = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), KlinesHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_chunks_are_stitched_in_order(server):
+    downloader = KlineDownloader(max_workers=4, base_url=server)
+    klines = downloader.get_historical_klines('DOGEUSDT', '1m', '1 Jan, 1900', LISTING + 5999 * MINUTE)
+    times = [kline[0] for kline in klines]
+    assert times == list(range(LISTING, LISTING + CANDLES * MINUTE, MINUTE))
+    # one request for the listing time, six chunks of 1000 candles, and retries after the 429s
+    chunk_requests = [r for r in KlinesHandler.requests if r['limit'] == 1000]
+    assert len({r['startTime'] for r in chunk_requests}) == 6
+
+
+def test_range_inside_history(server):
+    downloader = KlineDownloader(max_workers=2, base_url=server)
+    start = LISTING + 1234 * MINUTE
+    end = LISTING + 3456 * MINUTE
+    klines = downloader.get_historical_klines('DOGEUSDT', '1m', start, end)
+    assert [kline[0] for kline in klines] == list(range(start, end + 1, MINUTE))
+    assert float(klines[0][4]) == start
+
+
+def test_weight_limit_pauses(server, monkeypatch):
+    downloader = KlineDownloader(max_workers=1, base_url=server, weight_limit=2)
+    pauses = []
+    monkeypatch.setattr('downloader.time.sleep', pauses.append)
+    downloader.get_historical_klines('DOGEUSDT', '1m', LISTING, LISTING + 2500 * MINUTE)
+    assert pauses and all(0 < pause <= 60 for pause in pauses)
+
+
+def test_server_errors_and_timeouts_are_retried(server, monkeypatch):
+    KlinesHandler.failures = [503, 'slow', 500]
+    pauses = []
+    monkeypatch.setattr('downloader.time.sleep', pauses.append)
+    downloader = KlineDownloader(max_workers=1, base_url=server, timeout=0.2)
+    klines = downloader.get_historical_klines('DOGEUSDT', '1m', LISTING, LISTING + 999 * MINUTE)
+    assert [kline[0] for kline in klines] == list(range(LISTING, LISTING + 1000 * MINUTE, MINUTE))
+    assert pauses[:3] == [1, 2, 4]
+
+
+def test_client_errors_are_not_retried(server):
+    KlinesHandler.failures = [400]
+    downloader = KlineDownloader(max_workers=1, base_url=server)
+    with pytest.raises(urllib.error.HTTPError):
+        downloader.get_historical_klines('DOGEUSDT', '1m', LISTING, LISTING + 999 * MINUTE)
+    assert len(KlinesHandler.requests) == 1
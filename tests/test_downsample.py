@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from downsample import lttb, downsample_ohlcv
+
+rng = np.random.default_rng(11)
+x = np.arange(10000, dtype=float)
+y = np.cumsum(rng.normal(size=x.size))
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    spiky = y.copy()
+    spiky[1234] = 1000
+    spiky[8765] = -1000
+    kept = lttb(x, spiky, 500)
+    assert len(kept) == 500
+    assert kept[0] == 0 and kept[-1] == x.size - 1
+    assert (np.diff(kept) > 0).all()
+    assert 1234 in kept and 8765 in kept
+
+
+def test_lttb_small_input_and_nan():
+    assert list(lttb(x[:10], y[:10], 50)) == list(range(10))
+    gappy = y.copy()
+    gappy[:100] = np.nan
+    kept = lttb(x, gappy, 300)
+    assert len(kept) == 300 and kept[0] == 100
+    assert not np.isnan(gappy[kept]).any()
+
+
+def test_downsample_ohlcv_merges_candles():
+    close = 100 + y
+    frame = pd.DataFrame({'time': pd.date_range('2022-01-01', periods=x.size, freq='min'), 'open': close - 0.1,
+                          'high': close + 1, 'low': close - 1, 'close': close, 'volume': rng.lognormal(size=x.size)})
+    time, open, high, low, close, volume = downsample_ohlcv(*(frame[c].to_numpy() for c in frame.columns), 1000)
+    # 10000 one-minute candles into 1000 ten-minute ones
+    expected = frame.resample('10min', on='time').agg({'open': 'first', 'high': 'max', 'low': 'min',
+                                                       'close': 'last', 'volume': 'sum'})
+    np.testing.assert_array_equal(time, expected.index.to_numpy())
+    for column, values in zip(expected.columns, (open, high, low, close, volume)):
+        np.testing.assert_allclose(values, expected[column], rtol=1e-12)
@@ -0,0 +1,27 @@
+import json
+import subprocess
+import sys
+
+# imports get_data and computes an indicator, as a compute-only script would
+script = '''
+import json, sys, time
+start = time.perf_counter()
+import numpy, pandas
+dependencies = time.perf_counter()
+import get_data
+from indicators import ta
+ta.EMA(pandas.DataFrame({'close': numpy.arange(100.0)}), 10)
+end = time.perf_counter()
+print(json.dumps({'own': end - dependencies, 'modules': sorted(sys.modules)}))
+'''
+
+heavy = ['plotly', 'binance', 'tabulate', 'dateparser']
+
+
+def test_get_data_imports_fast():
+    output = subprocess.run([sys.executable, '-c', script], cwd='src', capture_output=True, text=True, check=True)
+    result = json.loads(output.stdout.splitlines()[-1])
+    loaded = {module.split('.')[0] for module in result['modules']}
+    assert not loaded & set(heavy)
+    # importing the project itself on top of numpy and pandas, plotly and binance alone take over a second
+    assert result['own'] < 0.5
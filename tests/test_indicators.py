@@ -1,6 +1,6 @@
 import pandas as pd
 
-from src.indicators import ta
+from indicators import ta
 
 ohlcv = pd.read_csv('tests/data/binance_doge-usdt.csv')
 cols = ['open', 'high', 'low', 'close', 'volume']
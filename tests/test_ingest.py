@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from ingest import klines_to_columns, klines_to_frame
+
+klines = [[1649116800000 + i * 60000, f'{0.1 + i * 1e-4:.8f}', '0.12345678', '0.11111111', '0.11500000',
+           '12345.67', 1649116800000 + i * 60000 + 59999, '1.0', 10, '1.0', '1.0', '0'] for i in range(50)]
+
+
+def row_wise(klines) -> pd.DataFrame:
+    ohlcv = pd.DataFrame(klines, columns=['time', 'open', 'high', 'low', 'close', 'volume', 'close_time',
+                                          'quote_asset_volume', 'number_of_trades', 'taker_buy_base_asset_volume',
+                                          'taker_buy_quote_asset_volume', 'ignore']).iloc[:, :6]
+    cols = ['open', 'high', 'low', 'close', 'volume']
+    ohlcv[cols] = ohlcv[cols].apply(pd.to_numeric, errors='coerce', axis=1)
+    return ohlcv
+
+
+def test_klines_to_frame_matches_row_wise_conversion():
+    ohlcv = klines_to_frame(klines)
+    pd.testing.assert_frame_equal(ohlcv, row_wise(klines), check_dtype=False)
+    assert ohlcv['time'].dtype == np.int64
+    assert (ohlcv.dtypes[1:] == np.float64).all()
+
+
+def test_non_numeric_values_become_nan():
+    broken = [list(kline) for kline in klines[:3]]
+    broken[1][4] = 'n/a'
+    data = klines_to_columns(broken)
+    assert np.isnan(data['close'][1])
+    assert data['close'][0] == 0.115
+
+
+def test_no_klines():
+    ohlcv = klines_to_frame([])
+    assert list(ohlcv.columns) == ['time', 'open', 'high', 'low', 'close', 'volume']
+    assert len(ohlcv) == 0
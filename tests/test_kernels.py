@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import kernels
+from indicators import FLOAT32_TOLERANCE, compute_indicator, ind_periods, ta
+from tests.reference import ta as reference
+
+ohlcv = pd.read_csv('tests/data/binance_doge-usdt.csv')
+cols = ['open', 'high', 'low', 'close', 'volume']
+ohlcv[cols] = ohlcv[cols].apply(pd.to_numeric, errors='coerce', axis=1)
+
+rng = np.random.default_rng(7)
+close = 30000 + np.cumsum(rng.normal(scale=25, size=20000))
+spread = np.abs(rng.normal(scale=20, size=close.size))
+synthetic = pd.DataFrame({'open': close, 'high': close + spread, 'low': close - spread, 'close': close,
+                          'volume': rng.lognormal(size=close.size)})
+
+
+def assert_close(actual, expected, scale=1.0):
+    np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-11 * scale)
+
+
+def compare(name, *args, frames=(ohlcv, synthetic), **kwargs):
+    for frame in frames:
+        scale = frame['close'].abs().max()
+        actual = getattr(ta, name)(frame, *args, **kwargs)
+        expected = getattr(reference, name)(frame, *args, **kwargs)
+        if isinstance(expected, list):
+            for a, e in zip(actual, expected):
+                assert_close(a.values, e.values, scale)
+        else:
+            assert isinstance(actual, pd.Series)
+            assert actual.name == expected.name
+            assert_close(actual.values, expected.values, scale)
+
+
+def test_moving_averages_match_pandas():
+    for name in ('SMA', 'SMM', 'SSMA', 'EMA', 'DEMA', 'TEMA', 'TRIMA', 'TRIX', 'VAMA', 'WMA', 'SMMA'):
+        for period in (1, 2, 14, 50):
+            compare(name, period)
+
+
+def test_oscillators_match_pandas():
+    compare('MACD')
+    compare('TR')
+    for period in (2, 14, 50):
+        for name in ('MOM', 'ROC', 'RSI', 'ATR', 'STOCH', 'WILLIAMS'):
+            compare(name, period)
+        compare('KC', period, period // 2 + 1)
+    # pandas' running variance drifts badly for short windows at high price levels, see test_rolling_std
+    compare('BBANDS', 14)
+    compare('BBANDS', 2, frames=[ohlcv])
+
+
+def test_rolling_std():
+    values = synthetic['close'].to_numpy()
+    for period in (2, 3, 14, 200):
+        windows = np.lib.stride_tricks.sliding_window_view(values, period)
+        expected = np.concatenate([np.full(period - 1, np.nan), windows.std(axis=1, ddof=1)])
+        np.testing.assert_allclose(kernels._rolling_std(values, period), expected, rtol=1e-12, atol=1e-12)
+
+
+def test_adjust_false_matches_pandas():
+    for name in ('SSMA', 'EMA', 'TRIX', 'SMMA', 'RSI'):
+        compare(name, 20, adjust=False)
+    compare('MACD', adjust=False)
+
+    # the reference only passes `adjust` to the outer EWMs of DEMA and TEMA
+    ema_1 = ohlcv['close'].ewm(span=20, adjust=False).mean()
+    ema_2 = ema_1.ewm(span=20, adjust=False).mean()
+    ema_3 = ema_2.ewm(span=20, adjust=False).mean()
+    assert_close(ta.DEMA(ohlcv, 20, adjust=False).values, (2 * ema_1 - ema_2).values)
+    assert_close(ta.TEMA(ohlcv, 20, adjust=False).values, (3 * ema_1 - 3 * ema_2 + ema_3).values)
+
+
+def test_bbands_are_taken_of_column():
+    # the reference always centres the bands on the SMA of the close
+    upper, middle, _ = ta.BBANDS(ohlcv, 14, column='open')
+    expected_upper, expected_middle, _ = reference.BBANDS(ohlcv, 14, column='open')
+    assert_close(middle.values, ta.SMA(ohlcv, 14, column='open').values)
+    assert_close((upper - middle).values, (expected_upper - expected_middle).values)
+
+
+def test_missing_values_match_pandas():
+    gappy = synthetic.copy()
+    gappy.loc[:99, cols] = np.nan
+    gappy.loc[5000:5003, 'close'] = np.nan
+    for name in ('SMA', 'SMM', 'EMA', 'TEMA', 'WMA', 'RSI', 'MOM'):
+        compare(name, 14, frames=[gappy])
+    compare('EMA', 14, adjust=False, frames=[gappy])
+    compare('BBANDS', 14, frames=[gappy])
+
+
+def test_wma_closed_form():
+    for frame in (ohlcv, synthetic):
+        for period in (1, 2, 3, 14, 99, 500):
+            expected = reference.WMA(frame, period).values
+            np.testing.assert_allclose(ta.WMA(frame, period).values, expected, rtol=1e-12, atol=1e-12)
+    gappy = synthetic['close'].to_numpy().copy()
+    gappy[[0, 700, 701]] = np.nan
+    expected = reference.WMA(pd.DataFrame({'close': gappy}), 30).values
+    np.testing.assert_allclose(kernels.wma(gappy, 30), expected, rtol=1e-12)
+
+
+def test_kernels_take_ndarrays():
+    values = synthetic['close'].to_numpy()
+    assert isinstance(kernels.sma(values, 10), np.ndarray)
+    assert kernels.ema(values, 10).shape == values.shape
+    upper, middle, lower = kernels.bbands(values, 20)
+    assert_close(middle, kernels.sma(values, 20))
+    assert np.isnan(kernels.sma(values[:5], 10)).all()
+
+
+def test_rolling_extremes_and_median_are_exact():
+    values = synthetic['close'].to_numpy().copy()
+    values[[0, 3000, 3001, 9999]] = np.nan
+    # repeated values, as prices on a tick grid have
+    values[5000:5400] = np.round(values[5000:5400], -1)
+    series = pd.Series(values)
+    for period in (1, 2, 3, 14, 21, 500, 5000):
+        rolling = series.rolling(period)
+        np.testing.assert_array_equal(kernels._rolling_max(values, period), rolling.max().values)
+        np.testing.assert_array_equal(kernels._rolling_min(values, period), rolling.min().values)
+        np.testing.assert_array_equal(kernels._rolling_median(values, period), rolling.median().values)
+    panel = np.stack([values, values[::-1]], axis=1)
+    np.testing.assert_array_equal(kernels._rolling_max(panel, 50)[:, 1], series[::-1].rolling(50).max().values)
+    np.testing.assert_array_equal(kernels._rolling_median(panel, 50)[:, 1],
+                                  series[::-1].rolling(50).median().values)
+
+
+def test_jit_backend_runs_the_pandas_recursion(monkeypatch):
+    pytest.importorskip('numba')
+    monkeypatch.setattr(kernels, 'JIT_MIN_SIZE', 0)
+    gappy = synthetic.copy()
+    gappy.loc[:99, cols] = np.nan
+    gappy.loc[5000:5003, 'close'] = np.nan
+    for frame in (synthetic, gappy):
+        close = frame['close']
+        for adjust in (True, False):
+            ema_1 = close.ewm(span=14, adjust=adjust).mean()
+            ema_2 = ema_1.ewm(span=14, adjust=adjust).mean()
+            ema_3 = ema_2.ewm(span=14, adjust=adjust).mean()
+            np.testing.assert_array_equal(kernels.ema(close, 14, adjust), ema_1.values)
+            np.testing.assert_array_equal(kernels.tema(close, 14, adjust), (3 * ema_1 - 3 * ema_2 + ema_3).values)
+            np.testing.assert_array_equal(kernels.smma(close, 14, adjust),
+                                          close.ewm(alpha=1 / 14, adjust=adjust).mean().values)
+    compare('RSI', 14, frames=[gappy])
+    compare('MACD', frames=[gappy])
+    panel = np.stack([synthetic['close'], gappy['close']], axis=1)
+    np.testing.assert_array_equal(kernels.ema_sweep(panel, [1, 14])[:, 1, 1], kernels.ema(gappy['close'], 14))
+
+
+def test_float32_stays_within_its_tolerance():
+    for frame in (ohlcv, synthetic):
+        single = frame[cols].astype(np.float32)
+        rounded = single.astype(float)
+        for name, tolerance in FLOAT32_TOLERANCE.items():
+            for period in (14, 200):
+                info = [name] + [period * (i + 1) for i in range(ind_periods[name])]
+                expected = compute_indicator(info, rounded)
+                for column, values in compute_indicator(info, single).items():
+                    assert values.dtype == np.float32, column
+                    error = np.abs(values.to_numpy(dtype=float) - expected[column].to_numpy())
+                    np.testing.assert_array_equal(np.isnan(error), expected[column].isna(), column)
+                    assert np.nanmax(error) <= tolerance * expected[column].abs().max(), column
+
+
+def test_float32_rolling_std_is_relatively_accurate():
+    # the deviation of the bands, tiny next to the prices it is computed from
+    values = synthetic['close'].to_numpy(dtype=np.float32)
+    for period in (2, 14, 200, 1000):
+        np.testing.assert_allclose(kernels._rolling_std(values, period),
+                                   kernels._rolling_std(values.astype(float), period), rtol=1e-4)
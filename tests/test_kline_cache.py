@@ -0,0 +1,70 @@
+import time
+
+import numpy as np
+from binance.helpers import date_to_milliseconds
+
+from kline_cache import KlineCache
+
+HOUR = 3600 * 1000
+LISTING = date_to_milliseconds('1 Jan, 2022')
+
+
+class FakeClient:
+    """
+    Hourly klines from LISTING until now, the price being the open time in hours
+    """
+
+    def __init__(self):
+        self.requests = []
+
+    def get_historical_klines(self, symbol, interval, start_str, end_str):
+        self.requests.append((start_str, end_str))
+        now = int(time.time() * 1000)
+        first = max(LISTING, -(-start_str // HOUR) * HOUR)
+        return [[t, str(t / HOUR), str(t / HOUR + 1), str(t / HOUR - 1), str(t / HOUR), '10.0', t + HOUR - 1,
+                 '0', 0, '0', '0', '0'] for t in range(first, min(end_str, now) + 1, HOUR)]
+
+
+def test_only_missing_ranges_are_downloaded(tmp_path):
+    client = FakeClient()
+    cache = KlineCache(tmp_path)
+
+    ohlcv = cache.load(client, 'DOGEUSDT', '1h', '1 Feb, 2022', '3 Feb, 2022')
+    assert len(client.requests) == 1
+    assert len(ohlcv) == 2 * 24 + 1
+    assert ohlcv['time'].iloc[0] == date_to_milliseconds('1 Feb, 2022')
+    np.testing.assert_array_equal(ohlcv['close'], ohlcv['time'] / HOUR)
+
+    # inside the cached range: nothing to download
+    inside = cache.load(client, 'DOGEUSDT', '1h', '1 Feb, 2022 10:00', '2 Feb, 2022')
+    assert len(client.requests) == 1
+    assert len(inside) == 15
+
+    # overlapping on both sides: only the leading and trailing parts
+    wider = cache.load(client, 'DOGEUSDT', '1h', '31 Jan, 2022', '4 Feb, 2022')
+    assert client.requests[1:] == [(date_to_milliseconds('31 Jan, 2022'), date_to_milliseconds('1 Feb, 2022') - 1),
+                                   (date_to_milliseconds('3 Feb, 2022') + 1, date_to_milliseconds('4 Feb, 2022'))]
+    assert len(wider) == 4 * 24 + 1
+    assert (np.diff(wider['time']) == HOUR).all()
+
+    # a new cache object reads the same file
+    again = KlineCache(tmp_path).load(client, 'DOGEUSDT', '1h', '31 Jan, 2022', '4 Feb, 2022')
+    assert len(client.requests) == 3
+    assert again.equals(wider)
+
+
+def test_before_listing_and_open_candle(tmp_path):
+    client = FakeClient()
+    cache = KlineCache(tmp_path)
+
+    ohlcv = cache.load(client, 'DOGEUSDT', '1h', '1 Jan, 1900', 'now')
+    assert ohlcv['time'].iloc[0] == LISTING
+    # the candle still open is returned but not stored, so it is downloaded again next time
+    data, covered = cache.read('DOGEUSDT', '1h')
+    assert len(data['time']) == len(ohlcv) - 1
+    assert covered[0] == date_to_milliseconds('1 Jan, 1900')
+
+    again = cache.load(client, 'DOGEUSDT', '1h', '1 Jan, 1900', 'now')
+    assert len(client.requests) == 2
+    assert client.requests[1][0] == covered[1] + 1
+    assert again['time'].iloc[-1] >= ohlcv['time'].iloc[-1]
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import indicator_columns, ta
+from live import LiveData, RingBuffer, follow
+
+ohlcv = pd.read_csv('tests/data/binance_doge-usdt.csv')
+cols = ['open', 'high', 'low', 'close', 'volume']
+ohlcv[cols] = ohlcv[cols].apply(pd.to_numeric, errors='coerce', axis=1)
+ohlcv['time'] = pd.to_datetime(ohlcv['time'])
+times = ohlcv['time'].to_numpy().astype('datetime64[ms]').astype(np.int64)
+
+indicators = [['volume'], ['sma', 20], ['ema', 14], ['rsi', 14], ['macd', 12, 26], ['bbands', 20], ['tr'],
+              ['atr', 14], ['stoch', 14], ['williams', 14], ['wma', 10], ['mom', 10], ['dema', 10], ['KC', 20],
+              ['ssma', 10], ['smma', 10], ['tema', 10], ['trix', 10]]
+
+
+def kline_message(i, pair='DOGEUSDT', closed=True):
+    row = ohlcv.iloc[i]
+    return {'e': 'kline', 's': pair, 'k': {'t': int(times[i]), 's': pair, 'i': '4h', 'x': closed,
+                                           'o': str(row['open']), 'h': str(row['high']), 'l': str(row['low']),
+                                           'c': str(row['close']), 'v': str(row['volume'])}}
+
+
+def expected_columns():
+    expected = {}
+    for info in indicators:
+        name, params = info[0].upper(), info[1:]
+        if name == 'VOLUME':
+            continue
+        result = getattr(ta, name)(ohlcv, *params)
+        for column, series in zip(indicator_columns(info), result if isinstance(result, list) else [result]):
+            expected[column] = series.to_numpy()
+    return expected
+
+
+def test_ring_buffer_keeps_last_rows():
+    buffer = RingBuffer(3, ['a'])
+    for i in range(5):
+        buffer.append(i, [float(i)])
+    frame = buffer.frame()
+    assert list(frame['a']) == [2.0, 3.0, 4.0]
+    assert list(buffer.frame(2)['a']) == [3.0, 4.0]
+    assert buffer.values.shape == (3, 1)
+
+
+def test_live_data_follows_stream():
+    live = LiveData('DOGEUSDT', '4h', indicators, capacity=100)
+    other = LiveData('BTCUSDT', '4h', [['sma', 5]], capacity=10)
+    feed = []
+    for i in range(len(ohlcv)):
+        feed += [kline_message(i, closed=False), kline_message(i), kline_message(i, 'BTCUSDT')]
+    follow([live, other], feed)
+
+    frame = live.ohlcv
+    assert len(frame) == 100 and len(other.ohlcv) == 10
+    pd.testing.assert_series_equal(frame['time'], ohlcv['time'].iloc[-100:].reset_index(drop=True),
+                                   check_names=False)
+    for column, values in expected_columns().items():
+        if column.startswith(('wma', 'mom')):
+            np.testing.assert_allclose(frame[column], values[-100:], rtol=1e-12)
+        else:
+            # streaming indicators repeat the sums and recursions of ta exactly
+            np.testing.assert_array_equal(frame[column], values[-100:])
+
+
+def test_seed_then_stream():
+    seeded = LiveData('DOGEUSDT', '4h', [['ema', 14], ['stoch', 14]], capacity=50)
+    seeded.seed(ohlcv.iloc[:400])
+    for i in range(390, len(ohlcv)):
+        seeded.on_message(kline_message(i))
+    streamed = LiveData('DOGEUSDT', '4h', [['ema', 14], ['stoch', 14]], capacity=50)
+    follow([streamed], [kline_message(i) for i in range(len(ohlcv))])
+    pd.testing.assert_frame_equal(seeded.ohlcv, streamed.ohlcv)
+
+
+def test_window_must_fit_in_capacity():
+    with pytest.raises(ValueError, match='599'):
+        LiveData('DOGEUSDT', '4h', [['trima', 300]], capacity=100)
+    LiveData('DOGEUSDT', '4h', [['trima', 300]], capacity=599)
+    # streamed indicators need no window
+    LiveData('DOGEUSDT', '4h', [['tema', 50], ['kc', 200]], capacity=10)
@@ -0,0 +1,51 @@
+import io
+
+import pandas as pd
+import pytest
+from tabulate import tabulate
+
+from output import print_table, export_frame, read_frame
+
+ohlcv = pd.read_csv('tests/data/binance_doge-usdt.csv', parse_dates=['time'])
+
+
+def tables(text):
+    # every psql table starts and ends with a +---+ line
+    return sum(line.startswith('+') for line in text.splitlines()) // 2
+
+
+def test_one_page_is_the_plain_table():
+    stream = io.StringIO()
+    print_table(ohlcv, stream, page_size=len(ohlcv))
+    assert stream.getvalue() == tabulate(ohlcv, headers='keys', tablefmt='psql') + '\n'
+
+
+def test_pages_head_and_tail():
+    stream = io.StringIO()
+    print_table(ohlcv, stream, page_size=120)
+    assert tables(stream.getvalue()) == 5
+
+    stream = io.StringIO()
+    print_table(ohlcv, stream, head=10, page_size=4)
+    assert tables(stream.getvalue()) == 3
+    assert stream.getvalue().rstrip().splitlines()[-2].startswith('|  9 |')
+
+    stream = io.StringIO()
+    print_table(ohlcv, stream, tail=3)
+    assert stream.getvalue() == tabulate(ohlcv.iloc[-3:], headers='keys', tablefmt='psql') + '\n'
+
+    stream = io.StringIO()
+    print_table(ohlcv, stream, page=2, page_size=100)
+    assert stream.getvalue() == tabulate(ohlcv.iloc[200:300], headers='keys', tablefmt='psql') + '\n'
+
+
+def test_export_csv(tmp_path):
+    for name in ('ohlcv.csv', 'ohlcv.csv.gz'):
+        export_frame(ohlcv, tmp_path / name, chunksize=64)
+        pd.testing.assert_frame_equal(read_frame(tmp_path / name), ohlcv)
+
+
+def test_export_parquet(tmp_path):
+    pytest.importorskip('pyarrow')
+    export_frame(ohlcv, tmp_path / 'ohlcv.parquet')
+    pd.testing.assert_frame_equal(read_frame(tmp_path / 'ohlcv.parquet'), ohlcv)
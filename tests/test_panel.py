@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from indicators import ta, make_panel
+
+ohlcv = pd.read_csv('tests/data/binance_doge-usdt.csv')
+cols = ['open', 'high', 'low', 'close', 'volume']
+ohlcv[cols] = ohlcv[cols].apply(pd.to_numeric, errors='coerce', axis=1)
+
+# a second symbol at another price level, and a third one listed 100 candles later
+other = ohlcv.copy()
+other[cols] = ohlcv[cols].values[::-1] * 1000
+late = ohlcv.iloc[100:].copy()
+late[cols] = late[cols] * 3
+symbols = {'DOGEUSDT': ohlcv, 'OTHERUSDT': other, 'LATEUSDT': late}
+panel = make_panel(symbols)
+
+cases = [('SMA', 14), ('SMM', 14), ('SSMA', 14), ('EMA', 14), ('DEMA', 14), ('TEMA', 14), ('TRIMA', 14),
+         ('TRIX', 14), ('VAMA', 14), ('WMA', 14), ('SMMA', 14), ('MOM', 14), ('ROC', 14), ('RSI', 14), ('ATR', 14),
+         ('STOCH', 14), ('WILLIAMS', 14), ('TR',), ('MACD',), ('BBANDS', 20), ('KC', 20)]
+
+
+def as_list(result):
+    return result if isinstance(result, list) else [result]
+
+
+def test_make_panel():
+    assert panel.shape == (len(ohlcv), 3 * 5)
+    assert list(panel['close'].columns) == sorted(symbols)
+    assert panel['close']['LATEUSDT'].isna().sum() == 100
+
+
+def test_panel_matches_single_symbol():
+    for name, *args in cases:
+        panel_results = as_list(getattr(ta, name)(panel, *args))
+        for symbol, frame in symbols.items():
+            single_results = as_list(getattr(ta, name)(frame, *args))
+            for panel_result, single_result in zip(panel_results, single_results):
+                assert isinstance(panel_result, pd.DataFrame)
+                column = panel_result[symbol].values[-len(frame):]
+                np.testing.assert_allclose(column, single_result.values, rtol=1e-10, atol=1e-12, err_msg=name)
+
+
+def test_panel_of_arrays():
+    arrays = {column: panel[column].to_numpy() for column in cols}
+    sma = ta.SMA(arrays, 14)
+    assert isinstance(sma, np.ndarray) and sma.shape == arrays['close'].shape
+    np.testing.assert_array_equal(sma, ta.SMA(panel, 14).to_numpy())
+    assert np.isnan(sma[:100 + 13, list(panel['close'].columns).index('LATEUSDT')]).all()
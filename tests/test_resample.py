@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from binance.helpers import date_to_milliseconds
+
+import get_data
+from resample import resample, ResamplePyramid, interval_ms
+
+MINUTE = 60 * 1000
+HOUR = 60 * MINUTE
+LISTING = date_to_milliseconds('1 Jan, 2022')
+rng = np.random.default_rng(5)
+size = 60 * 24 * 70
+close = 100 + np.cumsum(rng.normal(size=size))
+# starts on a Wednesday afternoon, neither on a day, week nor month boundary
+base = {'time': pd.Timestamp('2023-03-15 13:37').value // 10 ** 6 + MINUTE * np.arange(size),
+        'open': close + rng.normal(size=size), 'high': close + 2, 'low': close - 2, 'close': close,
+        'volume': rng.lognormal(size=size)}
+base['high'][::97] += 10
+base['low'][::89] -= 10
+
+rules = {'5m': '5min', '1h': '1H', '4h': '4H', '1d': '1D', '3d': '3D', '1w': 'W-MON', '1M': 'MS'}
+
+
+def pandas_resample(data, rule) -> pd.DataFrame:
+    frame = pd.DataFrame(data, index=pd.to_datetime(data['time'], unit='ms'))
+    resampler = frame.resample(rule, origin='epoch', label='left', closed='left')
+    result = resampler.agg({'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'})
+    result = result[resampler.size() > 0]
+    result.insert(0, 'time', result.index.values.astype('datetime64[ms]').astype(np.int64))
+    return result.reset_index(drop=True)
+
+
+def test_resample_matches_pandas():
+    for interval, rule in rules.items():
+        pd.testing.assert_frame_equal(pd.DataFrame(resample(base, interval)), pandas_resample(base, rule),
+                                      check_exact=False, rtol=1e-12)
+    weeks = resample(base, '1w')['time'].astype('datetime64[ms]')
+    assert (pd.DatetimeIndex(weeks).dayofweek == 0).all()
+
+
+def test_pyramid_updates_incrementally():
+    pyramid = ResamplePyramid('1m')
+    assert pyramid.parents['1h'] == '30m' and pyramid.parents['1w'] == '1d' and pyramid.parents['1M'] == '1d'
+    cuts = [0, 1, 500, 7000, 7001, 40_000, size]
+    for start, end in zip(cuts, cuts[1:]):
+        part = {column: values[max(start - 1, 0):end].copy() for column, values in base.items()}
+        if end < size:
+            # the last candle has not closed yet, it is sent again with the next part
+            part['close'][-1] += 1
+        pyramid.update(part)
+    for interval in interval_ms:
+        # volumes are summed level by level, which rounds differently
+        np.testing.assert_allclose(pd.DataFrame(pyramid[interval]), pd.DataFrame(resample(base, interval)),
+                                   rtol=1e-14, err_msg=interval)
+
+    # a candle sent again is written over the stored one, nothing before it is copied
+    stored = {interval: pyramid[interval] for interval in interval_ms}
+    last = {column: values[-1:].copy() for column, values in base.items()}
+    last['close'] += 1
+    pyramid.update(last)
+    for interval, data in stored.items():
+        assert np.shares_memory(pyramid[interval]['close'], data['close'])
+        assert pyramid[interval]['close'][-1] == last['close'][0]
+
+    with pytest.raises(ValueError):
+        ResamplePyramid('1w', ['1M'])
+
+
+def test_data_from_base_timeframe(fake_client):
+    data = get_data.Data('DOGEUSDT', '4h', '6 Jan, 2022 02:00', 'now', [['sma', 20], ['ema', 14], ['macd', 12, 26]],
+                         cache_dir=None, download_workers=1, base_timeframe='1h')
+    hourly = fake_client().get_historical_klines('DOGEUSDT', '1h', LISTING, fake_client.now)
+    expected = pandas_resample({column: np.array([kline[position] for kline in hourly], dtype=float)
+                                for column, position in [('time', 0), ('open', 1), ('high', 2), ('low', 3),
+                                                         ('close', 4), ('volume', 5)]}, '4H')
+    expected['time'] = pd.to_datetime(expected['time'], unit='ms')
+    # the first candle opens at the first 4h boundary after the start date
+    assert data.ohlcv['time'].iloc[0] == pd.Timestamp('6 Jan, 2022 04:00')
+    shown = expected[expected['time'] >= data.ohlcv['time'].iloc[0]].reset_index(drop=True)
+    pd.testing.assert_frame_equal(data.ohlcv[shown.columns].reset_index(drop=True), shown, check_dtype=False)
+    assert not data.ohlcv.isna().any().any()
+
+    fake_client.now += 5 * HOUR
+    assert data.refresh() == 1
+    assert data.ohlcv['time'].iloc[-1] - data.ohlcv['time'].iloc[-2] == pd.Timedelta(hours=4)
+    # refresh added the new hours to the pyramid the candles were built in
+    assert data.pyramid['1h']['time'][-1] == fake_client.now - fake_client.now % HOUR
+    np.testing.assert_array_equal(data.pyramid['4h']['time'][-len(data.ohlcv):],
+                                  data.ohlcv['time'].to_numpy().astype('datetime64[ms]').astype(np.int64))
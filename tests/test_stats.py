@@ -0,0 +1,56 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+import get_data
+from indicators import ta
+from stats import Stats, active_stats, stage
+
+ohlcv = pd.DataFrame({column: np.linspace(1, 2, 100_000) for column in ['open', 'high', 'low', 'close', 'volume']})
+
+
+def test_ta_calls_are_recorded():
+    seen = []
+    with Stats(memory=True, callbacks=[seen.append]) as stats:
+        with stage('job', rows=3):
+            ta.SMA(ohlcv, 20)
+            ta.VAMA(ohlcv=ohlcv, period=20)
+    ta.EMA(ohlcv, 20)
+    assert active_stats() is None
+    assert seen == stats.records
+    assert [record['stage'] for record in stats.records] == ['ta.SMA', 'ta.VAMA', 'job']
+    sma, vama, job = stats.records
+    assert sma['rows'] == len(ohlcv) and sma['parent'] == 'job' and job['parent'] is None
+    # at least the float64 result
+    assert sma['peak_bytes'] >= 8 * len(ohlcv)
+    assert job['peak_bytes'] >= max(sma['peak_bytes'], vama['peak_bytes'])
+    assert job['seconds'] >= sma['seconds'] + vama['seconds']
+
+    totals = stats.to_dict()
+    assert totals['job']['rows'] == 3 and totals['ta.SMA']['calls'] == 1
+    stream = io.StringIO()
+    stats.write_json_lines(stream)
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == stats.records
+
+
+def test_keyword_calls_are_recorded():
+    with Stats() as stats:
+        ta.SMA(period=10, ohlc=ohlcv)
+        ta.VAMA(period=10, ohlcv=ohlcv)
+    assert [record['rows'] for record in stats.records] == [len(ohlcv), len(ohlcv)]
+
+
+def test_data_stages(fake_client):
+    data = get_data.Data('DOGEUSDT', '1h', '3 Jan, 2022', 'now', [['rsi', 14]], cache_dir=None, download_workers=1)
+    data.stats = stats = Stats()
+    data.add_indicator(['sma', 10])
+    data.fig
+    fake_client.now += 2 * 3600 * 1000
+    data.refresh()
+    stages = [record['stage'] for record in stats.records]
+    assert stages[:3] == ['ta.SMA', 'indicator sma 10', 'figure']
+    assert {'load', 'fetch', 'convert', 'figure update', 'ta.RSI', 'indicator rsi 14'} <= set(stages)
+    assert stats.to_dict()['fetch']['rows'] == 3
+    assert active_stats() is None
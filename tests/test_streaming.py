@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+from indicators import ta
+from streaming import StreamingSMA, StreamingSMM, StreamingSSMA, StreamingEMA, StreamingDEMA, StreamingTEMA, \
+    StreamingTRIX, StreamingSMMA, StreamingRSI, StreamingTR, StreamingATR, StreamingMACD, StreamingBBANDS, StreamingKC, \
+    StreamingSTOCH, StreamingWILLIAMS
+
+ohlcv = pd.read_csv('tests/data/binance_doge-usdt.csv')
+cols = ['open', 'high', 'low', 'close', 'volume']
+ohlcv[cols] = ohlcv[cols].apply(pd.to_numeric, errors='coerce', axis=1)
+candles = list(zip(ohlcv['high'], ohlcv['low'], ohlcv['close']))
+
+
+def feed_close(indicator):
+    return np.array([indicator.update(close) for _, _, close in candles])
+
+
+def feed_hlc(indicator):
+    return np.array([indicator.update(high, low, close) for high, low, close in candles])
+
+
+def test_StreamingSMA():
+    for period in (1, 14, 20):
+        np.testing.assert_array_equal(feed_close(StreamingSMA(period)), ta.SMA(ohlcv, period).values)
+
+
+def test_StreamingSMM():
+    for period in (1, 2, 14, 20):
+        np.testing.assert_array_equal(feed_close(StreamingSMM(period)), ta.SMM(ohlcv, period).values)
+    gappy = np.round(np.random.default_rng(1).normal(size=3000), 1)
+    gappy[[0, 50, 51]] = np.nan
+    median = StreamingSMM(30)
+    np.testing.assert_array_equal([median.update(value) for value in gappy],
+                                  pd.Series(gappy).rolling(30).median().values)
+
+
+def test_StreamingEMA():
+    for period in (14, 20):
+        for adjust in (True, False):
+            np.testing.assert_array_equal(feed_close(StreamingEMA(period, adjust=adjust)),
+                                          ta.EMA(ohlcv, period, adjust=adjust).values)
+
+
+def test_streaming_ewm_chains():
+    for period in (10, 20):
+        for adjust in (True, False):
+            for cls, name in ((StreamingSSMA, 'SSMA'), (StreamingSMMA, 'SMMA'), (StreamingDEMA, 'DEMA'),
+                              (StreamingTEMA, 'TEMA'), (StreamingTRIX, 'TRIX')):
+                np.testing.assert_array_equal(feed_close(cls(period, adjust=adjust)),
+                                              getattr(ta, name)(ohlcv, period, adjust=adjust).values, err_msg=name)
+
+
+def test_StreamingKC():
+    streamed = np.array(feed_hlc(StreamingKC(20)))
+    for i, expected in enumerate(ta.KC(ohlcv, 20)):
+        np.testing.assert_array_equal(streamed[:, i], expected.values)
+
+
+def test_StreamingRSI():
+    for period in (7, 14):
+        np.testing.assert_array_equal(feed_close(StreamingRSI(period)), ta.RSI(ohlcv, period).values)
+
+
+def test_StreamingTR_ATR():
+    np.testing.assert_array_equal(feed_hlc(StreamingTR()), ta.TR(ohlcv).values)
+    for period in (10, 14):
+        np.testing.assert_array_equal(feed_hlc(StreamingATR(period)), ta.ATR(ohlcv, period).values)
+
+
+def test_StreamingMACD():
+    streamed = np.array(feed_close(StreamingMACD()))
+    for i, expected in enumerate(ta.MACD(ohlcv)):
+        np.testing.assert_array_equal(streamed[:, i], expected.values)
+
+
+def test_StreamingBBANDS():
+    streamed = np.array(feed_close(StreamingBBANDS(20)))
+    for i, expected in enumerate(ta.BBANDS(ohlcv, 20)):
+        np.testing.assert_array_equal(streamed[:, i], expected.values)
+
+
+def test_StreamingSTOCH_WILLIAMS():
+    np.testing.assert_array_equal(feed_hlc(StreamingSTOCH(14)), ta.STOCH(ohlcv, 14).values)
+    np.testing.assert_array_equal(feed_hlc(StreamingWILLIAMS(14)), ta.WILLIAMS(ohlcv, 14).values)
+
+
+def test_streaming_matches_kernels_on_long_gappy_series():
+    rng = np.random.default_rng(3)
+    close = 30000 + np.cumsum(rng.normal(scale=25, size=5000))
+    close[[0, 1, 700, 2500, 2501]] = np.nan
+    frame = pd.DataFrame({'high': close + 10, 'low': close - 10, 'close': close})
+    for period in (2, 14, 50, 200):
+        streamed = [StreamingSMA(period), StreamingEMA(period), StreamingRSI(period), StreamingBBANDS(period)]
+        streamed = [np.array([indicator.update(value) for value in close]) for indicator in streamed]
+        np.testing.assert_array_equal(streamed[0], ta.SMA(frame, period).values)
+        np.testing.assert_array_equal(streamed[1], ta.EMA(frame, period).values)
+        np.testing.assert_array_equal(streamed[2], ta.RSI(frame, period).values)
+        for i, expected in enumerate(ta.BBANDS(frame, period)):
+            np.testing.assert_array_equal(streamed[3][:, i], expected.values)
+        atr = StreamingATR(period)
+        np.testing.assert_array_equal([atr.update(high, low, value) for high, low, value in frame.values],
+                                      ta.ATR(frame, period).values)
+
+
+def test_streaming_value_is_last_update():
+    ema = StreamingEMA(14)
+    assert np.isnan(ema.value)
+    value = ema.update(0.17)
+    assert ema.value == value == 0.17
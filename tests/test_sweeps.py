@@ -0,0 +1,84 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from indicators import ta, make_panel
+
+ohlcv = pd.read_csv('tests/data/binance_doge-usdt.csv')
+cols = ['open', 'high', 'low', 'close', 'volume']
+ohlcv[cols] = ohlcv[cols].apply(pd.to_numeric, errors='coerce', axis=1)
+
+rng = np.random.default_rng(11)
+close = 30000 + np.cumsum(rng.normal(scale=25, size=5000))
+synthetic = pd.DataFrame({'close': close})
+periods = [1, 2, 5, 14, 20, 63, 200]
+
+
+def check_sweep(sweep, single, frame, **kwargs):
+    assert isinstance(sweep, pd.DataFrame)
+    assert list(sweep.columns) == periods and sweep.index.equals(frame.index)
+    for period in periods:
+        expected = single(frame, period, **kwargs)
+        np.testing.assert_allclose(sweep[period].values, expected.values, rtol=1e-9, atol=1e-12)
+
+
+def test_SMA_sweep():
+    for frame in (ohlcv, synthetic):
+        check_sweep(ta.SMA_sweep(frame, periods), ta.SMA, frame)
+
+
+def test_EMA_sweep():
+    for frame in (ohlcv, synthetic):
+        check_sweep(ta.EMA_sweep(frame, periods), ta.EMA, frame)
+        check_sweep(ta.EMA_sweep(frame, periods, adjust=False), ta.EMA, frame, adjust=False)
+
+
+def test_RSI_sweep():
+    for frame in (ohlcv, synthetic):
+        check_sweep(ta.RSI_sweep(frame, periods), ta.RSI, frame)
+
+
+def test_BBANDS_sweep():
+    for frame in (ohlcv, synthetic):
+        swept = ta.BBANDS_sweep(frame, range(2, 60, 7))
+        for period in range(2, 60, 7):
+            for band, expected in zip(swept, ta.BBANDS(frame, period)):
+                np.testing.assert_allclose(band[period].values, expected.values, rtol=1e-9, atol=1e-12)
+
+
+def test_sweep_with_missing_values():
+    gappy = synthetic.copy()
+    gappy.loc[:30, 'close'] = np.nan
+    gappy.loc[1000:1002, 'close'] = np.nan
+    check_sweep(ta.SMA_sweep(gappy, periods), ta.SMA, gappy)
+    check_sweep(ta.EMA_sweep(gappy, periods), ta.EMA, gappy)
+
+
+def test_panel_sweep():
+    other = ohlcv.copy()
+    other[cols] = ohlcv[cols].values[::-1] * 1000
+    panel = make_panel({'DOGEUSDT': ohlcv, 'OTHERUSDT': other})
+    for name in ('SMA_sweep', 'EMA_sweep', 'RSI_sweep'):
+        swept = getattr(ta, name)(panel, periods)
+        assert list(swept.columns.names) == ['symbol', 'period']
+        for symbol, frame in (('DOGEUSDT', ohlcv), ('OTHERUSDT', other)):
+            np.testing.assert_array_equal(swept[symbol].values, getattr(ta, name)(frame, periods).values)
+    for band, expected in zip(ta.BBANDS_sweep(panel, periods), ta.BBANDS_sweep(other, periods)):
+        np.testing.assert_array_equal(band['OTHERUSDT'].values, expected.values)
+
+
+def best_time(func, repeat=5):
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def test_sweeps_are_faster_than_a_loop():
+    frame = pd.DataFrame({'close': 30000 + np.cumsum(rng.normal(scale=25, size=20_000))})
+    many = range(5, 65)
+    for sweep, single in ((ta.EMA_sweep, ta.EMA), (ta.RSI_sweep, ta.RSI)):
+        assert best_time(lambda: sweep(frame, many)) < best_time(lambda: [single(frame, period) for period in many])
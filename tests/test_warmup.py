@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from indicators import ta, ind_periods, ind_warmup, warmup_bars, EWM_TOLERANCE
+
+ohlcv = pd.read_csv('tests/data/binance_doge-usdt.csv')
+cols = ['open', 'high', 'low', 'close', 'volume']
+ohlcv[cols] = ohlcv[cols].apply(pd.to_numeric, errors='coerce', axis=1)
+
+methods = {'sma': ta.SMA, 'smm': ta.SMM, 'ssma': ta.SSMA, 'ema': ta.EMA, 'dema': ta.DEMA, 'tema': ta.TEMA,
+           'trima': ta.TRIMA, 'trix': ta.TRIX, 'vama': ta.VAMA, 'wma': ta.WMA, 'smma': ta.SMMA, 'mom': ta.MOM,
+           'roc': ta.ROC, 'rsi': ta.RSI, 'atr': ta.ATR, 'bbands': ta.BBANDS, 'kc': ta.KC, 'stoch': ta.STOCH,
+           'williams': ta.WILLIAMS, 'tr': lambda ohlc: ta.TR(ohlc),
+           'macd': lambda ohlc, fast, slow: ta.MACD(ohlc, period_fast=fast, period_slow=slow)}
+ewm_based = {'ssma', 'ema', 'dema', 'tema', 'trix', 'smma', 'rsi', 'kc', 'macd'}
+
+
+def as_list(result):
+    return result if isinstance(result, list) else [result]
+
+
+def test_every_indicator_has_a_warmup():
+    assert set(ind_warmup) == set(ind_periods)
+
+
+def test_values_after_warmup_match_full_history():
+    first = 300
+    for name, method in methods.items():
+        for params in ([], [5], [14], [12, 26]):
+            if len(params) != ind_periods[name]:
+                continue
+            warmup = warmup_bars([[name] + params])
+            assert warmup <= first, name
+            full = as_list(method(ohlcv, *params))
+            trimmed = as_list(method(ohlcv.iloc[first - warmup:], *params))
+            for f, t in zip(full, trimmed):
+                expected = f.iloc[first:].to_numpy()
+                actual = t.loc[first:].to_numpy()
+                assert not np.isnan(actual).any(), name
+                if name in ewm_based:
+                    # relative to the size of the values, levels of nested EMAs add up
+                    np.testing.assert_allclose(actual, expected, rtol=0, atol=5 * EWM_TOLERANCE * np.abs(f).max())
+                else:
+                    np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-12)
+
+
+def test_warmup_bars_of_several_indicators():
+    assert warmup_bars([]) == 0
+    assert warmup_bars([['volume'], ['sma', 20], ['bbands', 30]]) == 29
+    assert warmup_bars([['KC', 20]]) == ind_warmup['kc'](20)